@@ -8,12 +8,26 @@
 
 import streamlit as st
 import pandas as pd
-import requests
+import numpy as np
+import httpx
 import json
+import os
+import hashlib
 from datetime import datetime
 from io import BytesIO
 import re
+import math
+import heapq
+import time
+import random
+import asyncio
+import threading
+import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 import altair as alt
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # ===== HIDE STREAMLIT DEFAULT HEADER - MUST BE FIRST =====
 hide_streamlit_style = """
@@ -273,44 +287,866 @@ PRICES_SHEET = "Prices"
 GENERAL_PRICES_SHEET = "General_prices"
 CLIENT_DETAILS_SHEET = "Client_details"
 
+# ETD month tabs ("May 2026", ...) are discovered from the spreadsheet; this list is
+# the fallback when its tab list cannot be read
+ETD_MONTHS = ["May 2026", "June 2026"]
+ETD_START_ROW = 13  # headers at row 14 (A14) of every month tab
+ETD_OPEN_MONTHS = 2  # the current and previous month stay open; older tabs are closed and never re-pulled
+ETD_DISCOVERY_TTL = 3600  # seconds between re-reads of the tab list
+
+# ETD columns parsed to dates once per load for the date range filter
+ETD_DATE_COLUMNS = ('Scheduled Date For Loading', 'Confirmation Date')
+
+# Fields covered by the article search index, and the longest gram it stores
+SEARCH_FIELDS = ('article', 'names', 'hs_code')
+SEARCH_GRAM_SIZE = 3
+
+# Client Orders paging: matched articles per page, order cards rendered per page
+CLIENT_ORDERS_PAGE_SIZE = 25
+CLIENT_ORDERS_CARD_BUDGET = 20
+
+# Rows per page for the shared record listings (prices, general list, catalog, ETD)
+LISTING_PAGE_SIZE = 25
+
+# Memoized filter results kept across reruns (least recently used dropped first)
+FILTER_MEMO_SIZE = 128
+
+# Typo-tolerant name search: result cap and minimum trigram similarity
+FUZZY_SEARCH_LIMIT = 20
+FUZZY_MIN_SCORE = 0.35
+
+# Joins cells in the precomputed row search text
+SEARCH_SEPARATOR = '\x1f'
+
+# Currency symbols for price display
+CURRENCY_SYMBOLS = {
+    "USD": "$",
+    "EUR": "€",
+    "SAR": "ر.س"
+}
+
+# Date formats found in the sheets (day-first, as typed by the team)
+DATE_FORMATS = ['%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%y', '%d/%m/%y', '%d-%m-%y', '%Y/%m/%d']
+
+# Column dtypes applied once while each sheet's frame is built
+# ('category' for repeated labels, 'float32' for prices/weights, 'date' for parsed dates)
+CEO_SPECIAL_SCHEMA = {'Currency': 'category', 'Incoterm': 'category', 'Expiry_Date': 'date'}
+ETD_SCHEMA = {'Client Name': 'category', 'Status': 'category', 'Concerned Employee': 'category'}
+SHEET_SCHEMAS = {
+    "Clients_CoC": {
+        'Client': 'category', 'Supplier': 'category', 'Article_Number': 'category',
+        'Product_Name': 'category', 'HS_Code': 'category', 'Packaging': 'category', 'Year': 'category'
+    },
+    PRICES_SHEET: {'Customer': 'category', 'Customer Name': 'category', 'Salesman': 'category', 'Price': 'float32'},
+    GENERAL_PRICES_SHEET: {'CATEG.': 'category', 'UOM': 'category', 'NEW EXW': 'float32', 'UNT WGT': 'float32'},
+    PRODUCT_CATALOG_SHEET: {'Supplier': 'category', 'Category': 'category', 'UOM': 'category'},
+    **{sheets["ceo_special"]: CEO_SPECIAL_SCHEMA for sheets in CLIENT_SHEETS.values()}
+}
+# Schemas for every tab of a spreadsheet, used when the tab has no entry of its own
+SPREADSHEET_SCHEMAS = {ETD_SHEET_ID: ETD_SCHEMA}
+
+# Tabs read by the dashboard loaders - fetched together, one batchGet per spreadsheet.
+# The open ETD month tabs join this list at runtime (see dashboard_sheet_names).
+DASHBOARD_SHEETS = [
+    (CDC_SHEET_ID, "Clients_CoC"),
+    (CDC_SHEET_ID, PRODUCT_CATALOG_SHEET),
+    (CDC_SHEET_ID, PRICES_SHEET),
+    (CDC_SHEET_ID, GENERAL_PRICES_SHEET),
+    (CLIENT_DETAILS_SHEET_ID, CLIENT_DETAILS_SHEET),
+] + [(CDC_SHEET_ID, sheets["ceo_special"]) for sheets in CLIENT_SHEETS.values()]
+
+# Background refresh of the dashboard tabs
+SHEET_REFRESH_INTERVAL = 240  # seconds, ahead of the 300s loader TTL
+SHEET_MAX_AGE = 300  # older values count as stale
+SHEET_STALE_WHILE_REVALIDATE = True  # serve stale values and refresh them in the background
+SHEET_RETRY_INTERVAL = 60  # seconds between refresh attempts after a failure
+MISSING_TAB_RECHECK_INTERVAL = 3600  # seconds a tab that came back 400/404 is left out of batch reads
+SHEET_VERSIONS_KEPT = 2  # cached builds kept per tab: the current version and the one appends build on
+LOADER_MAX_WORKERS = 4  # threads per view that loads several sheets or clients at once
+
+# Tabs that only grow at the bottom: refreshed by reading the rows after the last known one
+APPEND_ONLY_SHEETS = {(CDC_SHEET_ID, "Clients_CoC")}
+APPEND_OVERLAP_ROWS = 20  # known rows re-read with every tail and checked, so edits near the end force a full reload
+APPEND_FULL_SYNC_INTERVAL = 3600  # seconds; a periodic full reload catches edits further up
+
+# On-disk Arrow snapshots of built sheet frames, served on cold start
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sheet_snapshots")
+
+# Skip downloading tabs whose spreadsheet revision (Drive metadata) has not moved
+SHEET_REVISION_CHECK = True
+
+# Google Sheets transport
+SHEETS_API_URL = "https://sheets.googleapis.com/v4/spreadsheets"
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
+HTTP_TIMEOUT = (5, 30)  # (connect, read) seconds
+HTTP_POOL_SIZE = 10
+HTTP_MAX_CONCURRENCY = 4
+HTTP_MAX_RETRIES = 4
+HTTP_BACKOFF_BASE = 0.5
+HTTP_BACKOFF_MAX = 8
+HTTP_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# ============================================
+# GOOGLE SHEETS TRANSPORT
+# ============================================
+
+@st.cache_resource
+def get_sheet_io_loop():
+    """Event loop on a daemon thread running all sheet I/O coroutines, with the shared HTTP/2 client"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="sheet-io", daemon=True).start()
+    client = httpx.AsyncClient(
+        http2=True,
+        timeout=httpx.Timeout(HTTP_TIMEOUT[1], connect=HTTP_TIMEOUT[0]),
+        limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+    )
+    return {'loop': loop, 'client': client, 'slots': asyncio.Semaphore(HTTP_MAX_CONCURRENCY)}
+
+async def sheets_api_get_async(url, params=None):
+    """GET with timeout, concurrency cap and jittered exponential backoff on 429/5xx"""
+    io = get_sheet_io_loop()
+    
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        retry_after = None
+        try:
+            async with io['slots']:
+                response = await io['client'].get(url, params=params)
+            if response.status_code not in HTTP_RETRY_STATUSES or attempt == HTTP_MAX_RETRIES:
+                response.raise_for_status()
+                return response
+            retry_after = response.headers.get('Retry-After')
+        except httpx.TransportError:
+            if attempt == HTTP_MAX_RETRIES:
+                raise
+        
+        # Full jitter, waiting at least as long as the server's Retry-After, capped at HTTP_BACKOFF_MAX
+        delay = random.uniform(0, min(HTTP_BACKOFF_MAX, HTTP_BACKOFF_BASE * 2 ** attempt))
+        if retry_after and retry_after.isdigit():
+            delay = max(delay, min(float(retry_after), HTTP_BACKOFF_MAX))
+        await asyncio.sleep(delay)
+
+def run_sheet_io(coro):
+    """Run a sheet I/O coroutine on the I/O loop and wait for it - the sync entry point for existing callers"""
+    return asyncio.run_coroutine_threadsafe(coro, get_sheet_io_loop()['loop']).result()
+
+def sheet_range(sheet_name, first_row=None):
+    """A1 range covering columns A:Z of a tab (from first_row down, if given), quoted so any tab name is valid"""
+    rows = f"A{first_row}:Z" if first_row else "A:Z"
+    return "'" + sheet_name.replace("'", "''") + "'!" + rows
+
+async def fetch_sheet_values_async(sheet_id, sheet_name, first_row=None):
+    """Fetch the raw A:Z cell grid of one sheet tab"""
+    encoded_range = urllib.parse.quote(sheet_range(sheet_name, first_row))
+    url = f"{SHEETS_API_URL}/{sheet_id}/values/{encoded_range}"
+    response = await sheets_api_get_async(url, params={'key': API_KEY})
+    return response.json().get('values', [])
+
+async def fetch_sheet_values_batch_async(sheet_id, sheet_names, first_rows=None):
+    """Fetch several tabs of one spreadsheet in a single values:batchGet round trip"""
+    first_rows = first_rows or {}
+    url = f"{SHEETS_API_URL}/{sheet_id}/values:batchGet"
+    params = [('ranges', sheet_range(name, first_rows.get(name))) for name in sheet_names] + [('key', API_KEY)]
+    response = await sheets_api_get_async(url, params=params)
+    value_ranges = response.json().get('valueRanges', [])
+    # valueRanges come back in request order
+    return {name: value_range.get('values', []) for name, value_range in zip(sheet_names, value_ranges)}
+
+def fetch_sheet_titles(sheet_id):
+    """Titles of the tabs of a spreadsheet, in tab order"""
+    url = f"{SHEETS_API_URL}/{sheet_id}"
+    response = run_sheet_io(sheets_api_get_async(url, params={'fields': 'sheets.properties.title', 'key': API_KEY}))
+    return [sheet['properties']['title'] for sheet in response.json().get('sheets', [])]
+
+def etd_month_start(title):
+    """First day of the month an ETD tab title names ("May 2026", "Jun 2026"), or None"""
+    for fmt in ("%B %Y", "%b %Y"):
+        try:
+            return datetime.strptime(title.strip(), fmt).date()
+        except ValueError:
+            continue
+    return None
+
+@st.cache_data(ttl=ETD_DISCOVERY_TTL, show_spinner=False)
+def discover_etd_months():
+    """Month tabs of the ETD spreadsheet, oldest first"""
+    try:
+        titles = fetch_sheet_titles(ETD_SHEET_ID)
+    except httpx.HTTPError:
+        return list(ETD_MONTHS)
+    months = {title: etd_month_start(title) for title in titles}
+    months = {title: start for title, start in months.items() if start}
+    return sorted(months, key=months.get) or list(ETD_MONTHS)
+
+def is_open_etd_month(title):
+    """True for month tabs still being edited (see ETD_OPEN_MONTHS) and for tabs that name no month"""
+    start = etd_month_start(title)
+    if start is None:
+        return True
+    today = datetime.now().date()
+    return start.year * 12 + start.month > today.year * 12 + today.month - ETD_OPEN_MONTHS
+
+def dashboard_sheet_names(sheet_id):
+    """Dashboard tabs that live in the given spreadsheet"""
+    names = []
+    for dashboard_sheet_id, sheet_name in DASHBOARD_SHEETS:
+        if dashboard_sheet_id == sheet_id and sheet_name not in names:
+            names.append(sheet_name)
+    if sheet_id == ETD_SHEET_ID:
+        # Closed months are fetched once, on demand, and never refreshed
+        names += [month for month in discover_etd_months() if is_open_etd_month(month) and month not in names]
+    return names
+
+def dashboard_spreadsheets():
+    """Spreadsheets the background refresher keeps fresh"""
+    return list(dict.fromkeys([sheet_id for sheet_id, _ in DASHBOARD_SHEETS] + [ETD_SHEET_ID]))
+
+def is_missing_range_error(error):
+    """True when the API rejected the range itself (e.g. the tab does not exist)"""
+    return error.response.status_code in (400, 404)
+
+def mark_missing_tabs(sheet_id, missing, found):
+    """Record which tabs came back missing and which exist (again)"""
+    store = get_sheet_store()
+    checked_at = time.time()
+    with store['lock']:
+        for sheet_name in missing:
+            store['missing_tabs'][(sheet_id, sheet_name)] = checked_at
+        for sheet_name in found:
+            store['missing_tabs'].pop((sheet_id, sheet_name), None)
+
+async def fetch_sheet_group_async(sheet_id, sheet_names, first_rows=None):
+    """Batch-fetch tabs of one spreadsheet, falling back to per-tab reads.
+    
+    Tabs that recently came back missing are left out (and absent from the result)
+    until MISSING_TAB_RECHECK_INTERVAL has passed, so they don't fail every batch.
+    """
+    first_rows = first_rows or {}
+    missing_tabs = get_sheet_store()['missing_tabs']
+    now = time.time()
+    sheet_names = [
+        sheet_name for sheet_name in sheet_names
+        if now - missing_tabs.get((sheet_id, sheet_name), float('-inf')) >= MISSING_TAB_RECHECK_INTERVAL
+    ]
+    if not sheet_names:
+        return {}
+    try:
+        values = await fetch_sheet_values_batch_async(sheet_id, sheet_names, first_rows)
+        mark_missing_tabs(sheet_id, [], sheet_names)
+        return values
+    except httpx.HTTPStatusError as e:
+        if not is_missing_range_error(e):
+            raise
+        # A single missing tab fails the whole batch - read the tabs one by one, all at once
+        results = await asyncio.gather(
+            *(fetch_sheet_values_async(sheet_id, sheet_name, first_rows.get(sheet_name)) for sheet_name in sheet_names),
+            return_exceptions=True
+        )
+        values = {}
+        missing = []
+        for sheet_name, result in zip(sheet_names, results):
+            if isinstance(result, httpx.HTTPStatusError) and is_missing_range_error(result):
+                missing.append(sheet_name)
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            values[sheet_name] = result
+        mark_missing_tabs(sheet_id, missing, values)
+        return values
+
+def fetch_sheet_group(sheet_id, sheet_names, first_rows=None):
+    """Sync wrapper of fetch_sheet_group_async"""
+    return run_sheet_io(fetch_sheet_group_async(sheet_id, sheet_names, first_rows))
+
+# ============================================
+# SHARED SHEET STORE
+# ============================================
+
+@st.cache_resource
+def get_sheet_store():
+    """Process-wide raw sheet values, shared by every session"""
+    return {
+        'lock': threading.Lock(),
+        'refresh_locks': {},
+        'entries': {},
+        'pending': set(),
+        'revision_unsupported': set(),
+        'missing_tabs': {}
+    }
+
+@st.cache_resource
+def get_refresh_executor():
+    """Worker threads for stale-while-revalidate refreshes"""
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="sheet-revalidate")
+
+@st.cache_resource
+def get_version_history():
+    """Versions recently built by each content-keyed builder, newest last"""
+    return {'lock': threading.Lock(), 'versions': {}}
+
+def retire_old_versions(key, version):
+    """Record a newly built version under key; returns the versions that fell out of SHEET_VERSIONS_KEPT"""
+    history = get_version_history()
+    with history['lock']:
+        versions = history['versions'].setdefault(key, [])
+        if version in versions:
+            versions.remove(version)
+        versions.append(version)
+        retired = versions[:-SHEET_VERSIONS_KEPT]
+        del versions[:-SHEET_VERSIONS_KEPT]
+    return retired
+
+def sheet_refresh_lock(sheet_id):
+    """Lock serializing refreshes of one spreadsheet - different spreadsheets refresh in parallel"""
+    store = get_sheet_store()
+    with store['lock']:
+        return store['refresh_locks'].setdefault(sheet_id, threading.Lock())
+
+def sheet_refresh_group(sheet_id, sheet_name):
+    """Tabs fetched together with the given tab"""
+    sheet_names = dashboard_sheet_names(sheet_id)
+    return sheet_names if sheet_name in sheet_names else [sheet_name]
+
+def sheet_fingerprint(values):
+    """Content hash of a tab's raw values"""
+    return hashlib.sha1(json.dumps(values, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+def append_first_rows(sheet_id, sheet_names, now):
+    """Sheet row (1-based) to read from for each append-only tab that can sync incrementally"""
+    entries = get_sheet_store()['entries']
+    first_rows = {}
+    for sheet_name in sheet_names:
+        entry = entries.get((sheet_id, sheet_name))
+        if (sheet_id, sheet_name) not in APPEND_ONLY_SHEETS or not entry or not entry['values']:
+            continue
+        if now - entry.get('synced_at', 0) >= APPEND_FULL_SYNC_INTERVAL:
+            continue
+        first_rows[sheet_name] = max(1, len(entry['values']) - APPEND_OVERLAP_ROWS + 1)
+    return first_rows
+
+def append_sheet_rows(known, probe):
+    """Known values extended by the rows after them, or None when the re-read overlap shows edits.
+    
+    `probe` holds the tab from the first overlap row down (see append_first_rows).
+    """
+    overlap = min(APPEND_OVERLAP_ROWS, len(known))
+    if len(probe) < overlap or sheet_fingerprint(probe[:overlap]) != sheet_fingerprint(known[len(known) - overlap:]):
+        return None
+    return known + probe[overlap:]
+
+def sheets_age(sheet_id, sheet_names):
+    """Seconds since the oldest of the given tabs was fetched"""
+    entries = get_sheet_store()['entries']
+    ages = []
+    for sheet_name in sheet_names:
+        entry = entries.get((sheet_id, sheet_name))
+        if entry is None:
+            return float('inf')
+        ages.append(time.time() - entry['fetched_at'])
+    return max(ages) if ages else float('inf')
+
+def fetch_spreadsheet_revision(sheet_id):
+    """Drive revision number of a spreadsheet, or None when the metadata check is unavailable"""
+    store = get_sheet_store()
+    if not SHEET_REVISION_CHECK or sheet_id in store['revision_unsupported']:
+        return None
+    try:
+        response = run_sheet_io(sheets_api_get_async(f"{DRIVE_API_URL}/files/{sheet_id}", params={'fields': 'version', 'key': API_KEY}))
+        return response.json().get('version')
+    except httpx.HTTPStatusError as e:
+        # Drive API not enabled for this key, or the file is not visible to it
+        if e.response.status_code in (400, 401, 403, 404):
+            store['revision_unsupported'].add(sheet_id)
+        return None
+    except httpx.HTTPError:
+        return None
+
+def refresh_sheets(sheet_id, sheet_names, max_age=0):
+    """Refetch tabs of one spreadsheet and swap changed ones into the store in one step.
+    
+    Returns the (sheet_id, sheet_name) keys whose contents changed.
+    """
+    store = get_sheet_store()
+    with sheet_refresh_lock(sheet_id):
+        # Another session or the refresher may have fetched while we waited
+        if sheets_age(sheet_id, sheet_names) <= max_age:
+            return set()
+        
+        keys = [(sheet_id, sheet_name) for sheet_name in sheet_names]
+        revision = fetch_spreadsheet_revision(sheet_id)
+        previous_entries = [store['entries'].get(key) for key in keys]
+        if revision and all(entry and entry.get('revision') == revision for entry in previous_entries):
+            # Spreadsheet untouched since the last download - just mark the values fresh
+            checked_at = time.time()
+            with store['lock']:
+                entries = dict(store['entries'])
+                for key in keys:
+                    entries[key] = dict(entries[key], fetched_at=checked_at, error=None)
+                store['entries'] = entries
+            return set()
+        
+        try:
+            # Append-only tabs read just their tail (plus an overlap to verify) in the same batch
+            first_rows = append_first_rows(sheet_id, sheet_names, time.time())
+            values = fetch_sheet_group(sheet_id, sheet_names, first_rows)
+            appended = {}
+            for sheet_name in first_rows:
+                known = store['entries'][(sheet_id, sheet_name)]['values']
+                merged = append_sheet_rows(known, values.get(sheet_name, []))
+                if merged is not None:
+                    appended[sheet_name] = merged
+            edited = [sheet_name for sheet_name in first_rows if sheet_name not in appended]
+            if edited:
+                values.update(fetch_sheet_group(sheet_id, edited))
+            values.update(appended)
+        except Exception as e:
+            # Keep the last good values and remember the failure for the freshness notice
+            failed_at = time.time()
+            with store['lock']:
+                entries = dict(store['entries'])
+                for key in keys:
+                    if key in entries:
+                        entries[key] = dict(entries[key], error=str(e), failed_at=failed_at)
+                store['entries'] = entries
+            raise
+        
+        fetched_at = time.time()
+        changed = set()
+        with store['lock']:
+            entries = dict(store['entries'])
+            for key in keys:
+                previous = entries.get(key)
+                new_values = values.get(key[1], [])
+                # Appended tabs only hash their new rows, chained onto the previous hash
+                base = None
+                synced_at = fetched_at
+                if key[1] in appended:
+                    base = (previous['fingerprint'], len(previous['values']))
+                    synced_at = previous.get('synced_at', fetched_at)
+                    tail = new_values[len(previous['values']):]
+                    fingerprint = hashlib.sha1((previous['fingerprint'] + sheet_fingerprint(tail)).encode('utf-8')).hexdigest() if tail else previous['fingerprint']
+                elif previous and new_values == previous['values']:
+                    # A chained hash never equals the full-content one - keep it while the content is the same
+                    fingerprint = previous['fingerprint']
+                else:
+                    fingerprint = sheet_fingerprint(new_values)
+                if previous and previous['fingerprint'] == fingerprint:
+                    # Unchanged - keep the existing values so cached frames stay valid
+                    entries[key] = dict(previous, fetched_at=fetched_at, revision=revision, error=None, synced_at=synced_at)
+                elif not new_values and previous and previous['values']:
+                    # Never replace good data with an empty grid
+                    entries[key] = dict(previous, error="empty response", failed_at=fetched_at)
+                else:
+                    entries[key] = {
+                        'values': new_values,
+                        'fingerprint': fingerprint,
+                        'base': base,
+                        'revision': revision,
+                        'fetched_at': fetched_at,
+                        'synced_at': synced_at,
+                        'error': None
+                    }
+                    changed.add(key)
+            store['entries'] = entries
+        return changed
+
+def schedule_sheet_refresh(sheet_id, sheet_names):
+    """Refresh tabs in the background unless a refresh is already queued"""
+    store = get_sheet_store()
+    key = (sheet_id, tuple(sheet_names))
+    with store['lock']:
+        if key in store['pending']:
+            return
+        store['pending'].add(key)
+    
+    def revalidate():
+        try:
+            refresh_sheets(sheet_id, sheet_names, max_age=SHEET_MAX_AGE)
+        except Exception:
+            pass
+        finally:
+            with store['lock']:
+                store['pending'].discard(key)
+    
+    get_refresh_executor().submit(revalidate)
+
+def sheet_max_age(sheet_id, sheet_name):
+    """Age after which a tab's values count as stale - closed ETD months never do"""
+    if sheet_id == ETD_SHEET_ID and not is_open_etd_month(sheet_name):
+        return float('inf')
+    return SHEET_MAX_AGE
+
+def get_sheet_entry(sheet_id, sheet_name):
+    """Store entry for a tab - stale entries are served while they refresh in the background"""
+    sheet_names = sheet_refresh_group(sheet_id, sheet_name)
+    entry = get_sheet_store()['entries'].get((sheet_id, sheet_name))
+    
+    if entry is None:
+        # Nothing to serve yet - the first fetch has to block
+        refresh_sheets(sheet_id, sheet_names, max_age=SHEET_MAX_AGE)
+        return get_sheet_store()['entries'].get((sheet_id, sheet_name))
+    
+    if time.time() - entry['fetched_at'] > sheet_max_age(sheet_id, sheet_name):
+        if entry.get('error') and time.time() - entry['failed_at'] < SHEET_RETRY_INTERVAL:
+            return entry
+        if SHEET_STALE_WHILE_REVALIDATE:
+            schedule_sheet_refresh(sheet_id, sheet_names)
+        else:
+            try:
+                refresh_sheets(sheet_id, sheet_names, max_age=SHEET_MAX_AGE)
+            except Exception:
+                pass
+            entry = get_sheet_store()['entries'].get((sheet_id, sheet_name))
+    return entry
+
+def peek_sheet_entry(sheet_id, sheet_name):
+    """Store entry for a tab without fetching or revalidating it"""
+    return get_sheet_store()['entries'].get((sheet_id, sheet_name))
+
+def sheet_version(sheet_name, start_row=0, sheet_id=CDC_SHEET_ID):
+    """Content hash of a tab - a cache key that only moves when the sheet changes"""
+    if peek_sheet_entry(sheet_id, sheet_name) is None:
+        # Cold start - the snapshot load_sheet_data will serve carries its own hash
+        meta = read_snapshot_meta(snapshot_path(sheet_id, sheet_name, start_row))
+        if meta:
+            return meta['fingerprint']
+    try:
+        entry = get_sheet_entry(sheet_id, sheet_name)
+        return entry['fingerprint'] if entry else None
+    except Exception:
+        return None
+
+def stale_sheets():
+    """(tab name, fetched_at) of tabs served from an older copy because their refresh failed"""
+    return sorted(
+        (sheet_name, entry['fetched_at'])
+        for (_, sheet_name), entry in get_sheet_store()['entries'].items()
+        if entry.get('error')
+    )
+
+# ============================================
+# SHEET SNAPSHOTS
+# ============================================
+
+def snapshot_path(sheet_id, sheet_name, start_row):
+    """Snapshot file for one range of a spreadsheet"""
+    range_key = hashlib.sha1(f"{sheet_range(sheet_name)}|{start_row}".encode('utf-8')).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, sheet_id, f"{range_key}.arrow")
+
+def read_snapshot_meta(path):
+    """Snapshot metadata (headers, content hash, fetch time) or None"""
+    try:
+        import pyarrow as pa
+        with pa.memory_map(path, 'r') as source:
+            metadata = pa.ipc.open_file(source).schema.metadata or {}
+        return json.loads(metadata[b'sheet_snapshot'])
+    except Exception:
+        return None
+
+def write_sheet_snapshot(df, sheet_id, sheet_name, start_row, fingerprint, fetched_at):
+    """Persist a built frame as an uncompressed (memory-mappable) Arrow IPC file"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return
+    
+    path = snapshot_path(sheet_id, sheet_name, start_row)
+    meta = read_snapshot_meta(path) if os.path.exists(path) else None
+    if meta and meta.get('fingerprint') == fingerprint:
+        return
+    
+    try:
+        # Positional column names - sheet headers may be blank or repeated
+        table = pa.Table.from_pandas(df.set_axis([f"c{i}" for i in range(len(df.columns))], axis=1), preserve_index=False)
+        meta = {
+            'sheet_id': sheet_id,
+            'range': sheet_range(sheet_name),
+            'start_row': start_row,
+            'fingerprint': fingerprint,
+            'fetched_at': fetched_at,
+            'headers': [str(col) for col in df.columns]
+        }
+        table = table.replace_schema_metadata(dict(table.schema.metadata or {}, sheet_snapshot=json.dumps(meta)))
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    except Exception:
+        pass
+
+def read_sheet_snapshot(sheet_id, sheet_name, start_row):
+    """Last persisted frame for a range, read through a memory map, or None"""
+    path = snapshot_path(sheet_id, sheet_name, start_row)
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow as pa
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+            df = table.to_pandas()
+        meta = json.loads(table.schema.metadata[b'sheet_snapshot'])
+        df.columns = meta['headers']
+        for col in range(len(df.columns)):
+            dtype = df.dtypes.iloc[col]
+            if pd.api.types.is_string_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+                # Text comes back as str dtype with NaN on pandas 3 - built frames hold objects with pd.NA
+                column = df.iloc[:, col].astype(object)
+                df.isetitem(col, column.where(column.notna(), pd.NA))
+        # to_pandas restores the attrs stored with the frame (e.g. a stale appended_from)
+        df.attrs = {}
+        df.attrs['version'] = frame_version(sheet_id, sheet_name, start_row, meta['fingerprint'])
+        return df
+    except Exception:
+        return None
+
+def warm_sheet_caches(changed):
+    """Rebuild the cached loaders whose tabs changed in the last refresh round"""
+    changed_names = {sheet_name for _, sheet_name in changed}
+    
+    if CLIENT_DETAILS_SHEET in changed_names:
+        load_client_details.clear()
+        load_client_details()
+    if PRODUCT_CATALOG_SHEET in changed_names:
+        load_product_catalog.clear()
+        load_product_catalog()
+    if PRICES_SHEET in changed_names:
+        load_prices_data.clear()
+        load_prices_data()
+    if GENERAL_PRICES_SHEET in changed_names:
+        load_general_prices_data.clear()
+        load_general_prices_data()
+    if any(sheets["ceo_special"] in changed_names for sheets in CLIENT_SHEETS.values()):
+        load_ceo_special_prices.clear()
+        for client in CLIENT_SHEETS:
+            load_ceo_special_prices(client)
+    if any(sheet_id == ETD_SHEET_ID for sheet_id, _ in changed):
+        load_etd_table([month for month in discover_etd_months() if is_open_etd_month(month)])
+    if "Clients_CoC" in changed_names:
+        build_search_indexes(sheet_version("Clients_CoC"))
+        for client in get_all_clients_from_master():
+            get_google_sheets_data(client)
+            get_latest_prices_table(client)
+
+def run_sheet_refresher():
+    """Refresh every dashboard spreadsheet, then sleep until the next round"""
+    while True:
+        changed = set()
+        for sheet_id in dashboard_spreadsheets():
+            try:
+                sheet_names = dashboard_sheet_names(sheet_id)
+                if sheet_names:
+                    changed |= refresh_sheets(sheet_id, sheet_names, max_age=SHEET_REFRESH_INTERVAL / 2)
+            except Exception:
+                # Keep serving the last good values until the next round
+                continue
+        if changed:
+            try:
+                warm_sheet_caches(changed)
+            except Exception:
+                pass
+        time.sleep(SHEET_REFRESH_INTERVAL)
+
+@st.cache_resource
+def start_sheet_refresher():
+    """Start the background refresher once per server process"""
+    thread = threading.Thread(target=run_sheet_refresher, name="sheet-refresher", daemon=True)
+    thread.start()
+    return thread
+
 # ============================================
 # HELPER FUNCTIONS
 # ============================================
 
-@st.cache_data(ttl=300)
 def load_sheet_data(sheet_name, start_row=0, sheet_id=CDC_SHEET_ID):
     """Universal Google Sheets loader"""
     try:
-        import urllib.parse
-        encoded_sheet = urllib.parse.quote(sheet_name)
-        url = f"https://sheets.googleapis.com/v4/spreadsheets/{sheet_id}/values/{encoded_sheet}!A:Z?key={API_KEY}"
-        
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            values = data.get('values', [])
-            
-            if len(values) > start_row:
-                headers = values[start_row]
-                headers_count = len(headers)
-                rows = values[start_row + 1:] if len(values) > start_row + 1 else []
-                
-                padded_rows = []
-                for row in rows:
-                    if len(row) < headers_count:
-                        row = row + [''] * (headers_count - len(row))
-                    elif len(row) > headers_count:
-                        row = row[:headers_count]
-                    padded_rows.append(row)
-                
-                df = pd.DataFrame(padded_rows, columns=headers)
-                df = df.replace('', pd.NA)
-                return df
+        if peek_sheet_entry(sheet_id, sheet_name) is None:
+            # Cold start - serve the on-disk snapshot and revalidate in the background
+            snapshot = read_sheet_snapshot(sheet_id, sheet_name, start_row)
+            if snapshot is not None:
+                schedule_sheet_refresh(sheet_id, sheet_refresh_group(sheet_id, sheet_name))
+                return snapshot
+        
+        entry = get_sheet_entry(sheet_id, sheet_name)
+        return build_sheet_frame(entry['values'], entry['fetched_at'], start_row, sheet_id, sheet_name, entry['fingerprint'], _base=entry.get('base'))
+    except httpx.HTTPStatusError:
         return pd.DataFrame()
     except Exception as e:
         st.error(f"Error loading {sheet_name}: {str(e)}")
         return pd.DataFrame()
 
+def load_concurrently(loaders):
+    """Run {key: loader} callables on worker threads, yielding (key, result) as each one finishes.
+    
+    The loaders are the usual cached loaders, so their results also land in the caches.
+    Workers run under the calling script's context, so st.cache_data and st.error behave
+    as in the script thread. Loaders must not call load_concurrently themselves.
+    """
+    ctx = get_script_run_ctx()
+    # The workers attach the context as they start and exit with this call,
+    # so a session's context never outlives its loads on a reused thread
+    executor = ThreadPoolExecutor(
+        max_workers=min(LOADER_MAX_WORKERS, len(loaders)) or 1,
+        thread_name_prefix="sheet-loader",
+        initializer=add_script_run_ctx if ctx is not None else None,
+        initargs=(None, ctx) if ctx is not None else ()
+    )
+    futures = {executor.submit(loader): key for key, loader in loaders.items()}
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # The caller stopped early (or a loader failed) - drop the loads not started yet
+        executor.shutdown(wait=False, cancel_futures=True)
+
+@st.cache_data(max_entries=64)
+def build_sheet_frame(_values, _fetched_at, start_row, sheet_id, sheet_name, fingerprint, _base=None):
+    """DataFrame from raw sheet values, cached per content hash of the tab.
+    
+    `_base` is (fingerprint, row count) of the values these extend by appending rows;
+    the frame for that prefix is then reused and only the new rows are built.
+    """
+    values = _values
+    if len(values) <= start_row:
+        return pd.DataFrame()
+    
+    headers = values[start_row]
+    schema = SHEET_SCHEMAS.get(sheet_name) or SPREADSHEET_SCHEMAS.get(sheet_id, {})
+    if _base and _base[1] > start_row:
+        base_fingerprint, base_rows = _base
+        base = build_sheet_frame(values[:base_rows], _fetched_at, start_row, sheet_id, sheet_name, base_fingerprint)
+        tail = frame_from_rows(headers, values[base_rows:])
+        apply_sheet_schema(tail, schema)
+        df = append_frame_rows(base, tail)
+        df.attrs['appended_from'] = (base.attrs.get('version'), len(base))
+    else:
+        df = frame_from_rows(headers, values[start_row + 1:])
+        apply_sheet_schema(df, schema)
+    df.attrs['version'] = frame_version(sheet_id, sheet_name, start_row, fingerprint)
+    write_sheet_snapshot(df, sheet_id, sheet_name, start_row, fingerprint, _fetched_at)
+    # Older versions of this tab are dead weight - drop them from the cache
+    for old in retire_old_versions(('frame', sheet_id, sheet_name, start_row), fingerprint):
+        build_sheet_frame.clear(None, None, start_row, sheet_id, sheet_name, old)
+    return df
+
+def frame_from_rows(headers, rows):
+    """Object frame of ragged sheet rows under the given headers, blanks as NA"""
+    # Let pandas lay the ragged rows out in one pass (short rows come back padded
+    # with None) instead of copying every row to pad it in Python
+    cells = pd.DataFrame(rows, dtype=object).to_numpy(copy=True) if rows else np.empty((0, 0), dtype=object)
+    if cells.shape[1] >= len(headers):
+        cells = cells[:, :len(headers)]
+    else:
+        cells = np.hstack([cells, np.full((len(rows), len(headers) - cells.shape[1]), None, dtype=object)])
+    cells[pd.isna(cells) | (cells == '')] = pd.NA
+    return pd.DataFrame(cells, columns=headers, dtype=object)
+
+def append_frame_rows(base, tail):
+    """base with tail's rows appended; categorical columns keep base's categories and add the new ones"""
+    base = base.copy(deep=False)
+    for i in range(len(base.columns)):
+        column = base.iloc[:, i]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            new = tail.iloc[:, i]
+            new_labels = new.cat.categories if isinstance(new.dtype, pd.CategoricalDtype) else pd.Index(new.dropna().unique())
+            categories = column.cat.categories.append(new_labels.difference(column.cat.categories, sort=False))
+            base.isetitem(i, column.cat.set_categories(categories))
+            tail.isetitem(i, pd.Categorical(new, categories=categories))
+    return pd.concat([base, tail], ignore_index=True)
+
+def frame_version(sheet_id, sheet_name, start_row, fingerprint):
+    """Identity of a built sheet frame, carried in df.attrs['version'] through filters and copies"""
+    return f"{sheet_id}|{sheet_name}|{start_row}|{fingerprint}"
+
+def join_row_text(df):
+    """Lowercased text of each row, cells joined with a separator so matches cannot span cells"""
+    text = pd.Series('', index=df.index, dtype=object)
+    for i in range(len(df.columns)):
+        column = df.iloc[:, i]
+        if pd.api.types.is_datetime64_any_dtype(column.dtype):
+            # Typed date columns are searched the way the sheet writes them, not as timestamps
+            cells = column.dt.strftime(DATE_FORMATS[0]).where(column.notna(), '')
+        else:
+            cells = column.astype(str).where(column.notna(), '')
+        text = cells if i == 0 else text + SEARCH_SEPARATOR + cells
+    return text.str.lower()
+
+@st.cache_resource(max_entries=32)
+def build_row_search_text(version, _df):
+    """Row search text for one frame version, built once and shared across sessions"""
+    return join_row_text(_df)
+
+def row_search_text(df):
+    """Search text aligned to df's rows, reusing the text built when its sheet was loaded"""
+    version = df.attrs.get('version')
+    if version is None:
+        return join_row_text(df)
+    text = build_row_search_text(version, df).reindex(df.index)
+    missing = text.isna()
+    if missing.any():
+        text[missing] = join_row_text(df[missing])
+    return text
+
+def search_rows(df, term, regex=False):
+    """Mask of rows with a cell containing term, case-insensitive (a literal match unless regex=True)"""
+    text = row_search_text(df)
+    if regex:
+        return text.str.contains(term, case=False, regex=True, na=False)
+    return text.str.contains(term.lower(), regex=False, na=False)
+
+def parse_date_column(values):
+    """Parse a column of date text in one go; cells matching no known format become NaT"""
+    values = pd.Series(values, copy=False)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    
+    # Each distinct string is parsed once, however often it repeats
+    codes, uniques = pd.factorize(values)
+    labels = pd.Series([str(label).strip() for label in uniques], dtype=object)
+    parsed = pd.Series(pd.NaT, index=labels.index, dtype='datetime64[ns]')
+    
+    # Try the column's dominant format first; later formats only see the leftovers
+    sample = labels.head(50)
+    formats = sorted(DATE_FORMATS, key=lambda fmt: -pd.to_datetime(sample, format=fmt, errors='coerce').notna().sum())
+    pending = labels != ''
+    for fmt in formats:
+        if not pending.any():
+            break
+        matched = pd.to_datetime(labels[pending], format=fmt, errors='coerce').dropna()
+        parsed[matched.index] = matched.to_numpy(dtype='datetime64[ns]')
+        pending[matched.index] = False
+    
+    dates = np.append(parsed.to_numpy(), np.datetime64('NaT', 'ns'))
+    return pd.Series(dates[codes], index=values.index)
+
+@st.cache_resource(max_entries=32)
+def build_frame_dates(version, column, _values):
+    """Parsed dates of one column of one frame version, shared across sessions"""
+    return parse_date_column(_values)
+
+def frame_dates(df, column):
+    """Parsed dates of df[column], reusing the dates parsed when its sheet was loaded"""
+    version = df.attrs.get('version')
+    if version is None:
+        return parse_date_column(df[column])
+    return build_frame_dates(version, column, df[column]).reindex(df.index)
+
+def apply_sheet_schema(df, schema):
+    """Convert the declared columns of a freshly built frame in place"""
+    for i, header in enumerate(df.columns):
+        dtype = schema.get(str(header).strip())
+        if dtype is None:
+            continue
+        column = df.iloc[:, i]
+        if dtype == 'date':
+            df.isetitem(i, parse_date_column(column))
+        elif dtype.startswith('float'):
+            df.isetitem(i, pd.to_numeric(column, errors='coerce').astype(dtype))
+        else:
+            df.isetitem(i, column.astype(dtype))
+
 @st.cache_data(ttl=300)
 def load_client_details():
     """Load client details from Client_details sheet"""
@@ -318,6 +1154,7 @@ def load_client_details():
         df = load_sheet_data(CLIENT_DETAILS_SHEET, sheet_id=CLIENT_DETAILS_SHEET_ID)
         if not df.empty:
             df.columns = df.columns.str.strip()
+            row_search_text(df)
             return df
         return pd.DataFrame()
     except Exception as e:
@@ -371,102 +1208,377 @@ def get_all_clients_from_master():
     except:
         return []
 
-@st.cache_data(ttl=300)
+def text_column(df, column):
+    """Stripped string form of every cell in a column (empty when the column is missing)"""
+    if column not in df.columns:
+        return np.full(len(df), '', dtype=object)
+    values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Convert each category once; missing cells (code -1) pick the trailing 'nan'
+        labels = [str(label).strip() for label in values.cat.categories] + ['nan']
+        return np.array(labels, dtype=object)[values.cat.codes.to_numpy()]
+    text = np.array([str(value).strip() for value in values.tolist()], dtype=object)
+    text[values.isna().to_numpy()] = 'nan'
+    return text
+
+def parse_price_text(price_str):
+    """Split a price cell such as '€12.50' or '45 SAR' into (value, currency)"""
+    if not price_str or price_str == 'nan':
+        return None, "USD"
+    if '€' in price_str or 'EUR' in price_str.upper():
+        currency = "EUR"
+        price_clean = price_str.replace('€', '').replace('EUR', '').strip()
+    elif 'ريال' in price_str or 'SAR' in price_str.upper() or 'ر.س' in price_str:
+        currency = "SAR"
+        price_clean = re.sub(r'[ريالSARر.س\s]', '', price_str).strip()
+    else:
+        currency = "USD"
+        price_clean = price_str.replace('$', '').replace('USD', '').strip()
+    try:
+        return float(price_clean.replace(',', '')), currency
+    except ValueError:
+        return None, currency
+
 def get_google_sheets_data(client="CDC"):
-    """Load client data from Clients_CoC master sheet with currency support"""
+    """Order stores of one client from the Clients_CoC master sheet, keyed by supplier"""
+    return build_client_data(client, sheet_version("Clients_CoC"))
+
+@st.cache_data(max_entries=64)
+def build_client_data(client, version):
+    """Per-client view of the shared order stores (returned as a private copy)"""
+    for old in retire_old_versions(('client_data', client), version):
+        build_client_data.clear(client, old)
     try:
-        master_df = load_sheet_data("Clients_CoC")
-        
-        if master_df.empty:
-            return {"Backaldrin": {}, "Bateel": {}}
-        
-        client_df = master_df[master_df['Client'] == client].copy()
-        
-        if client_df.empty:
-            return {"Backaldrin": {}, "Bateel": {}}
-        
-        backaldrin_df = client_df[client_df['Supplier'] == 'Backaldrin']
-        bateel_df = client_df[client_df['Supplier'] == 'Bateel']
-        
-        def convert_df_to_dict(df):
-            result = {}
-            if df.empty:
-                return result
-            
-            article_col = 'Article_Number'
-            product_col = 'Product_Name'
-            price_col = 'Price'
-            order_col = 'Order_Number'
-            date_col = 'Order_Date'
-            year_col = 'Year'
-            hs_code_col = 'HS_Code'
-            packaging_col = 'Packaging'
-            quantity_col = 'Quantity'
-            weight_col = 'Total_Weight'
-            total_price_col = 'Total_Price'
-            
-            if article_col not in df.columns:
-                return result
-            
-            for _, row in df.iterrows():
-                article = str(row.get(article_col, '')).strip()
-                if not article or article == 'nan':
-                    continue
-                    
-                if article not in result:
-                    result[article] = {'names': [], 'prices': [], 'prices_with_currency': [], 'orders': [], 'article': article}
-                
-                product_name = str(row.get(product_col, '')).strip()
-                if product_name and product_name != 'nan' and product_name not in result[article]['names']:
-                    result[article]['names'].append(product_name)
-                
-                # Extract price and currency
-                price_str = str(row.get(price_col, '')).strip()
-                price_value = None
-                currency = "USD"
-                
-                if price_str and price_str != 'nan':
-                    if '€' in price_str or 'EUR' in price_str.upper():
-                        currency = "EUR"
-                        price_clean = price_str.replace('€', '').replace('EUR', '').strip()
-                    elif 'ريال' in price_str or 'SAR' in price_str.upper() or 'ر.س' in price_str:
-                        currency = "SAR"
-                        price_clean = re.sub(r'[ريالSARر.س\s]', '', price_str).strip()
-                    else:
-                        currency = "USD"
-                        price_clean = price_str.replace('$', '').replace('USD', '').strip()
-                    
-                    try:
-                        price_value = float(price_clean.replace(',', ''))
-                        result[article]['prices'].append(price_value)
-                        result[article]['prices_with_currency'].append({'value': price_value, 'currency': currency})
-                    except:
-                        pass
-                
-                order_details = {
-                    'order_no': str(row.get(order_col, '')).strip() if order_col in df else '',
-                    'date': str(row.get(date_col, '')).strip() if date_col in df else '',
-                    'year': str(row.get(year_col, '')).strip() if year_col in df else '',
-                    'product_name': product_name,
-                    'article': article,
-                    'hs_code': str(row.get(hs_code_col, '')).strip() if hs_code_col in df else '',
-                    'packaging': str(row.get(packaging_col, '')).strip() if packaging_col in df else '',
-                    'quantity': str(row.get(quantity_col, '')).strip() if quantity_col in df else '',
-                    'total_weight': str(row.get(weight_col, '')).strip() if weight_col in df else '',
-                    'price': price_str,
-                    'price_value': price_value,
-                    'currency': currency,
-                    'total_price': str(row.get(total_price_col, '')).strip() if total_price_col in df else ''
-                }
-                result[article]['orders'].append(order_details)
-            
-            return result
-        
-        return {"Backaldrin": convert_df_to_dict(backaldrin_df), "Bateel": convert_df_to_dict(bateel_df)}
-        
+        return build_client_indexes(version).get(client, empty_client_orders())
     except Exception as e:
         st.error(f"Error loading data for {client}: {str(e)}")
-        return {"Backaldrin": {}, "Bateel": {}}
+        return empty_client_orders()
+
+@st.cache_resource
+def get_index_reuse():
+    """Last built order stores and their derived indexes, kept so appended versions can reuse them"""
+    return {'clients': (None, None), 'search': {}, 'fuzzy': {}}
+
+@st.cache_resource(max_entries=2)
+def build_client_indexes(version):
+    """Order stores for every client, built in one pass per Clients_CoC version"""
+    master_df = load_sheet_data("Clients_CoC")
+    indexes = {}
+    if master_df.empty:
+        return indexes
+    
+    reuse = get_index_reuse()
+    base_version, base_indexes = reuse['clients']
+    appended_from = master_df.attrs.get('appended_from')
+    if appended_from and base_indexes is not None and appended_from[0] == frame_version(CDC_SHEET_ID, "Clients_CoC", 0, base_version):
+        # Rows were only appended - rebuild just the client/supplier stores that gained orders
+        indexes = {client: dict(suppliers) for client, suppliers in base_indexes.items()}
+        tail = master_df.iloc[appended_from[1]:]
+        for client, supplier in tail[['Client', 'Supplier']].drop_duplicates().itertuples(index=False):
+            if pd.notna(client) and supplier in ("Backaldrin", "Bateel"):
+                group = master_df[(master_df['Client'] == client) & (master_df['Supplier'] == supplier)]
+                indexes.setdefault(client, empty_client_orders())[supplier] = build_order_store(group)
+    else:
+        for (client, supplier), group in master_df.groupby(['Client', 'Supplier'], observed=True, sort=False):
+            if supplier in ("Backaldrin", "Bateel"):
+                indexes.setdefault(client, empty_client_orders())[supplier] = build_order_store(group)
+    reuse['clients'] = (version, indexes)
+    return indexes
+
+def reuse_store_index(kind, key, store, build):
+    """Derived index of an order store, reused while the store object itself is unchanged"""
+    memo = get_index_reuse()[kind]
+    cached = memo.get(key)
+    if cached is not None and cached[0] is store:
+        return cached[1]
+    index = build(store)
+    memo[key] = (store, index)
+    return index
+
+def empty_client_orders():
+    return {"Backaldrin": build_order_store(pd.DataFrame()), "Bateel": build_order_store(pd.DataFrame())}
+
+def build_order_store(df):
+    """Columnar order table for one client/supplier slice of Clients_CoC.
+    
+    Rows are grouped by article in first-seen order. `offsets` maps each article
+    to its [start, stop) row range, `names` to its distinct product names,
+    `price_range` to its (min, max) parsed price (None when it has none) and
+    `latest` to the row of its most recent dated order (its first row when none
+    has a usable date).
+    """
+    if 'Article_Number' not in df.columns:
+        df = pd.DataFrame(columns=['Article_Number'])
+    articles = text_column(df, 'Article_Number')
+    keep = (articles != '') & (articles != 'nan')
+    df, articles = df[keep], articles[keep]
+    
+    codes, uniques = pd.factorize(articles)
+    rows = np.argsort(codes, kind='stable')
+    column = lambda name: text_column(df, name)[rows]
+    
+    # Price text repeats heavily, so each distinct value is parsed once
+    prices = column('Price')
+    parsed_prices = {price_str: parse_price_text(price_str) for price_str in set(prices)}
+    dates = column('Order_Date')
+    orders = pd.DataFrame({
+        'article': pd.Categorical.from_codes(codes[rows], categories=uniques),
+        'order_no': pd.Categorical(column('Order_Number')),
+        'date': pd.Categorical(dates),
+        'order_date': parse_date_column(dates).to_numpy(dtype='datetime64[ns]'),
+        'year': pd.Categorical(column('Year')),
+        'product_name': pd.Categorical(column('Product_Name')),
+        'hs_code': pd.Categorical(column('HS_Code')),
+        'packaging': pd.Categorical(column('Packaging')),
+        'quantity': pd.Categorical(column('Quantity')),
+        'total_weight': pd.Categorical(column('Total_Weight')),
+        'price': pd.Categorical(prices),
+        'price_value': np.array([parsed_prices[price_str][0] for price_str in prices], dtype=float),
+        'currency': pd.Categorical([parsed_prices[price_str][1] for price_str in prices]),
+        'total_price': pd.Categorical(column('Total_Price'))
+    })
+    
+    counts = np.bincount(codes, minlength=len(uniques))
+    stops = np.cumsum(counts)
+    starts = stops - counts
+    product_names = orders['product_name'].to_numpy()
+    # NaT sorts below every real date, so argmax finds the first latest dated order
+    order_dates = orders['order_date'].to_numpy().view('i8')
+    price_values = orders['price_value'].to_numpy()
+    min_prices = np.fmin.reduceat(price_values, starts) if len(starts) else starts
+    max_prices = np.fmax.reduceat(price_values, starts) if len(starts) else starts
+    offsets, names, price_range, latest = {}, {}, {}, {}
+    for article, start, stop, min_price, max_price in zip(uniques, starts.tolist(), stops.tolist(), min_prices.tolist(), max_prices.tolist()):
+        offsets[article] = (start, stop)
+        names[article] = list(dict.fromkeys(name for name in product_names[start:stop] if name and name != 'nan'))
+        price_range[article] = (None, None) if math.isnan(min_price) else (min_price, max_price)
+        latest[article] = start + int(np.argmax(order_dates[start:stop]))
+    
+    return {'orders': orders, 'offsets': offsets, 'names': names, 'price_range': price_range, 'latest': latest}
+
+def article_orders(store, article):
+    """Order rows of one article (empty for an unknown article)"""
+    start, stop = store['offsets'].get(article, (0, 0))
+    return store['orders'].iloc[start:stop]
+
+def order_records(orders):
+    """Order rows as dicts for rendering, with missing prices and dates as None"""
+    records = orders.to_dict('records')
+    for record in records:
+        if pd.isna(record['price_value']):
+            record['price_value'] = None
+        record['order_date'] = None if pd.isna(record['order_date']) else record['order_date'].date()
+    return records
+
+def latest_article_order(store, article):
+    """Most recent order of an article, as a record"""
+    row = store['latest'][article]
+    return order_records(store['orders'].iloc[row:row + 1])[0]
+
+def get_latest_prices_table(client):
+    """Latest price of every article a client has ordered"""
+    return build_latest_prices_table(client, sheet_version("Clients_CoC"))
+
+@st.cache_data(max_entries=64)
+def build_latest_prices_table(client, version):
+    """Whole-catalog latest price table, highest price first"""
+    for old in retire_old_versions(('latest_prices', client), version):
+        build_latest_prices_table.clear(client, old)
+    tables = []
+    for supplier, store in build_client_data(client, version).items():
+        if not store['offsets']:
+            continue
+        latest = store['orders'].iloc[list(store['latest'].values())]
+        price_values = latest['price_value'].fillna(0).to_numpy()
+        symbols = latest['currency'].astype(str).map(lambda currency: CURRENCY_SYMBOLS.get(currency, '$'))
+        tables.append(pd.DataFrame({
+            'Article': list(store['offsets']),
+            'Product Name': [names[0] if names else 'N/A' for names in store['names'].values()],
+            'HS Code': latest['hs_code'].astype(str).to_numpy(),
+            'Packaging': latest['packaging'].astype(str).to_numpy(),
+            'Supplier': supplier,
+            'Latest Price': price_values,
+            'Latest Price Formatted': np.where(price_values != 0, symbols + pd.Series(price_values).map('{:.2f}'.format).to_numpy(), latest['price'].to_numpy()),
+            'Currency': latest['currency'].astype(str).to_numpy(),
+            'Last Order Date': latest['date'].astype(str).to_numpy(),
+            'Total Orders': [stop - start for start, stop in store['offsets'].values()]
+        }))
+    if not tables:
+        return pd.DataFrame()
+    return pd.concat(tables, ignore_index=True).sort_values('Latest Price', ascending=False)
+
+@st.cache_resource(max_entries=2)
+def build_search_indexes(version):
+    """Article search indexes for every client/supplier, built once per Clients_CoC version"""
+    return {
+        (client, supplier): reuse_store_index('search', (client, supplier), store, build_search_index)
+        for client, suppliers in build_client_indexes(version).items()
+        for supplier, store in suppliers.items()
+    }
+
+def build_search_index(store):
+    """Map every 1..SEARCH_GRAM_SIZE character gram of each field to the articles containing it"""
+    fields = {field: {'texts': {}, 'grams': {}} for field in SEARCH_FIELDS}
+    hs_codes = text_column(store['orders'], 'hs_code')
+    for article, (start, stop) in store['offsets'].items():
+        field_texts = {
+            'article': {article.lower()},
+            'names': {str(name).lower() for name in store['names'][article]},
+            'hs_code': {hs_code.lower() for hs_code in hs_codes[start:stop]}
+        }
+        for field, texts in field_texts.items():
+            fields[field]['texts'][article] = texts
+            grams = fields[field]['grams']
+            for text in texts:
+                for size in range(1, SEARCH_GRAM_SIZE + 1):
+                    for i in range(len(text) - size + 1):
+                        grams.setdefault(text[i:i + size], set()).add(article)
+    return {'position': {article: i for i, article in enumerate(store['offsets'])}, 'fields': fields}
+
+def field_matches(field_index, query):
+    """Articles with a text in this field containing query (already lowercased)"""
+    grams = field_index['grams']
+    if len(query) <= SEARCH_GRAM_SIZE:
+        return grams.get(query, set())
+    
+    # Every gram of the query must occur in a match; verify the survivors
+    postings = sorted((grams.get(query[i:i + SEARCH_GRAM_SIZE], set()) for i in range(len(query) - SEARCH_GRAM_SIZE + 1)), key=len)
+    candidates = set.intersection(*postings)
+    texts = field_index['texts']
+    return {article for article in candidates if any(query in text for text in texts[article])}
+
+def search_articles(client, supplier, query, fields=SEARCH_FIELDS):
+    """Case-insensitive substring search over a client's articles, in sheet order.
+    
+    Returns {article: first field in `fields` that matched}.
+    """
+    index = build_search_indexes(sheet_version("Clients_CoC")).get((client, supplier))
+    if index is None:
+        return {}
+    query = query.lower()
+    matches = {}
+    for field in fields:
+        found = index['position'].keys() if not query else field_matches(index['fields'][field], query)
+        for article in found:
+            matches.setdefault(article, field)
+    return dict(sorted(matches.items(), key=lambda item: index['position'][item[0]]))
+
+def name_trigrams(text):
+    """Trigrams of each word, padded so word starts and ends count as well"""
+    words = re.findall(r'\w+', str(text).lower())
+    return {f"  {word} "[i:i + 3] for word in words for i in range(len(word) + 1)}
+
+def build_fuzzy_index(documents):
+    """Trigram postings over (key, text) pairs for ranking near matches"""
+    index = {'keys': [], 'sizes': [], 'grams': {}}
+    for key, text in documents:
+        grams = name_trigrams(text)
+        if not grams:
+            continue
+        doc = len(index['keys'])
+        index['keys'].append(key)
+        index['sizes'].append(len(grams))
+        for gram in grams:
+            index['grams'].setdefault(gram, []).append(doc)
+    return index
+
+def fuzzy_rank(index, query):
+    """{key: best similarity} for every key scoring at least FUZZY_MIN_SCORE.
+    
+    The score averages how much of the query a text covers with the Dice
+    coefficient of their trigram sets, so typos and word order cost little
+    while long, loosely related names rank below close ones.
+    """
+    query_grams = name_trigrams(query)
+    if not query_grams:
+        return {}
+    shared = Counter()
+    for gram in query_grams:
+        shared.update(index['grams'].get(gram, ()))
+    scores = {}
+    for doc, count in shared.items():
+        coverage = count / len(query_grams)
+        dice = 2 * count / (len(query_grams) + index['sizes'][doc])
+        score = (coverage + dice) / 2
+        key = index['keys'][doc]
+        if score >= FUZZY_MIN_SCORE and score > scores.get(key, 0):
+            scores[key] = score
+    return scores
+
+def build_store_fuzzy_index(store):
+    """Name similarity index over one order store's product names"""
+    return build_fuzzy_index((article, name) for article, names in store['names'].items() for name in names)
+
+@st.cache_resource(max_entries=2)
+def build_fuzzy_indexes(version):
+    """Name similarity indexes for every client/supplier, built once per Clients_CoC version"""
+    return {
+        (client, supplier): reuse_store_index('fuzzy', (client, supplier), store, build_store_fuzzy_index)
+        for client, suppliers in build_client_indexes(version).items()
+        for supplier, store in suppliers.items()
+    }
+
+@st.cache_resource(max_entries=2)
+def build_catalog_fuzzy_index(version):
+    """Similarity index over catalog product names and common descriptions"""
+    catalog = load_product_catalog()
+    documents = []
+    for column in ['Product_Name', 'Common_Description']:
+        if not catalog.empty and column in catalog.columns:
+            documents.extend(zip(text_column(catalog, 'Article_Number'), text_column(catalog, column)))
+    return build_fuzzy_index((article, text) for article, text in documents if text != 'nan')
+
+def fuzzy_search_articles(client, supplier, query, limit=FUZZY_SEARCH_LIMIT):
+    """A client's articles ranked by name similarity to query: [(article, score)], best first"""
+    version = sheet_version("Clients_CoC")
+    client_index = build_fuzzy_indexes(version).get((client, supplier))
+    search_index = build_search_indexes(version).get((client, supplier))
+    if client_index is None or search_index is None:
+        return []
+    scores = fuzzy_rank(client_index, query)
+    for article, score in fuzzy_rank(build_catalog_fuzzy_index(sheet_version(PRODUCT_CATALOG_SHEET)), query).items():
+        if article in search_index['position'] and score > scores.get(article, 0):
+            scores[article] = score
+    return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+def client_order_matches(store, client, supplier, search_term, search_type):
+    """Summary dicts of the articles in `store` matching a Client Orders search, best match first"""
+    match_types = {'article': "Article Number", 'names': "Product Name", 'hs_code': "HS Code"}
+    if search_type == "Similar Name":
+        matches = {article: f"Similar Name ({score:.0%})" for article, score in fuzzy_search_articles(client, supplier, search_term)}
+    else:
+        search_fields = [field for field, label in match_types.items() if search_type in ["All", label]]
+        matches = {article: match_types[field] for article, field in search_articles(client, supplier, search_term, search_fields).items()}
+    
+    search_results = []
+    for article_num, match_type in matches.items():
+        if article_num in store['offsets']:
+            start, stop = store['offsets'][article_num]
+            names = store['names'][article_num]
+            min_price, max_price = store['price_range'][article_num]
+            
+            search_results.append({
+                'article': article_num,
+                'product_name': names[0] if names else "",
+                'match_type': match_type,
+                'orders_count': stop - start,
+                'min_price': min_price,
+                'max_price': max_price
+            })
+    return search_results
+
+def order_date_mask(orders, filter_type, selected_year=None, start_date=None, end_date=None):
+    """Boolean array over a store's order table for the Client Orders date filter"""
+    if filter_type == "Year" and selected_year:
+        # Orders without a Year value fall back to the year of their order date
+        years = orders['year'].astype(str).str.strip()
+        undated = (years == '') | (years == 'nan')
+        mask = (years == selected_year) | (undated & (orders['order_date'].dt.year == int(selected_year)))
+    elif filter_type == "Date Range" and start_date and end_date:
+        mask = orders['order_date'].between(pd.Timestamp(start_date), pd.Timestamp(end_date))
+    else:
+        mask = pd.Series(True, index=orders.index)
+    return mask.to_numpy()
 
 @st.cache_data(ttl=600)
 def load_product_catalog():
@@ -474,6 +1586,7 @@ def load_product_catalog():
     try:
         df = load_sheet_data(PRODUCT_CATALOG_SHEET)
         if not df.empty and 'Article_Number' in df.columns:
+            row_search_text(df)
             return df
         return pd.DataFrame()
     except Exception as e:
@@ -486,8 +1599,6 @@ def load_prices_data():
     try:
         df = load_sheet_data(PRICES_SHEET)
         if not df.empty:
-            if 'Price' in df.columns:
-                df['Price'] = pd.to_numeric(df['Price'], errors='coerce')
             return df
         return pd.DataFrame()
     except Exception as e:
@@ -500,10 +1611,7 @@ def load_general_prices_data():
     try:
         df = load_sheet_data(GENERAL_PRICES_SHEET)
         if not df.empty:
-            if 'NEW EXW' in df.columns:
-                df['NEW EXW'] = pd.to_numeric(df['NEW EXW'], errors='coerce')
-            if 'UNT WGT' in df.columns:
-                df['UNT WGT'] = pd.to_numeric(df['UNT WGT'], errors='coerce')
+            row_search_text(df)
             return df
         return pd.DataFrame()
     except Exception as e:
@@ -519,52 +1627,62 @@ def load_ceo_special_prices(client="CDC"):
         if not df.empty:
             required_cols = ['Article_Number', 'Product_Name', 'Special_Price', 'Currency', 'Incoterm']
             if all(col in df.columns for col in required_cols):
+                row_search_text(df)
                 return df
         return pd.DataFrame()
     except Exception as e:
         return pd.DataFrame()
 
-@st.cache_data(ttl=180)
 def load_etd_data(sheet_id, sheet_name):
     """Load ETD data from Google Sheet - headers at row 14 (A14)"""
     try:
-        import urllib.parse
-        encoded_sheet = urllib.parse.quote(sheet_name)
-        url = f"https://sheets.googleapis.com/v4/spreadsheets/{sheet_id}/values/{encoded_sheet}!A:Z?key={API_KEY}"
-        
-        response = requests.get(url)
-        if response.status_code == 200:
-            data = response.json()
-            values = data.get('values', [])
-            
-            if not values:
-                return pd.DataFrame()
-            
-            # Headers are at row 14 (index 13)
-            if len(values) > 13:
-                headers = values[13]
-                headers = [str(h).strip() if h else f"Column_{i}" for i, h in enumerate(headers)]
-                
-                rows = values[14:] if len(values) > 14 else []
-                
-                padded_rows = []
-                for row in rows:
-                    if len(row) < len(headers):
-                        row = row + [''] * (len(headers) - len(row))
-                    elif len(row) > len(headers):
-                        row = row[:len(headers)]
-                    padded_rows.append(row)
-                
-                df = pd.DataFrame(padded_rows, columns=headers)
-                df = df.replace('', pd.NA)
-                return df
-            else:
-                return pd.DataFrame()
-        else:
+        df = load_sheet_data(sheet_name, start_row=ETD_START_ROW, sheet_id=sheet_id)
+        if df.empty:
             return pd.DataFrame()
+        df.columns = [str(h).strip() if pd.notna(h) and h else f"Column_{i}" for i, h in enumerate(df.columns)]
+        return df
     except Exception as e:
         return pd.DataFrame()
 
+def load_etd_table(months):
+    """ETD orders of several month tabs merged into one table with a Month column"""
+    # Months neither in the store nor snapshotted come down together in one batchGet
+    # rather than one blocking read each
+    missing = [
+        month for month in months
+        if peek_sheet_entry(ETD_SHEET_ID, month) is None
+        and not os.path.exists(snapshot_path(ETD_SHEET_ID, month, ETD_START_ROW))
+    ]
+    if missing:
+        try:
+            refresh_sheets(ETD_SHEET_ID, missing, max_age=SHEET_MAX_AGE)
+        except Exception:
+            pass
+    month_versions = tuple((month, sheet_version(month, ETD_START_ROW, ETD_SHEET_ID)) for month in months)
+    return build_etd_table(month_versions)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def build_etd_table(month_versions):
+    """Merged ETD table for the given (month, content hash) pairs; unchanged months come from the frame cache"""
+    months = [month for month, _ in month_versions]
+    frames = []
+    for month in months:
+        df = load_etd_data(ETD_SHEET_ID, month)
+        if not df.empty:
+            df.insert(0, 'Month', month)
+            frames.append(df)
+    if not frames:
+        return pd.DataFrame()
+    
+    table = pd.concat(frames, ignore_index=True, sort=False)
+    apply_sheet_schema(table, ETD_SCHEMA)
+    table['Month'] = pd.Categorical(table['Month'], categories=months)
+    table.attrs['version'] = frame_version(ETD_SHEET_ID, "+".join(months), ETD_START_ROW, "|".join(str(version) for _, version in month_versions))
+    for column in ETD_DATE_COLUMNS:
+        if column in table.columns:
+            frame_dates(table, column)
+    return table
+
 def add_to_search_history(search_term, client, supplier, article_num=None):
     """Add search to history"""
     if 'search_history' not in st.session_state:
@@ -581,6 +1699,80 @@ def add_to_search_history(search_term, client, supplier, article_num=None):
     if len(st.session_state.search_history) > 20:
         st.session_state.search_history = st.session_state.search_history[:20]
 
+def paginate(total, page_size, key):
+    """Page picker for `total` rows; returns the (start, stop) slice of the current page"""
+    pages = max(1, -(-total // page_size))
+    if pages == 1:
+        return 0, total
+    # A shorter result set than last rerun must not leave the picker past its end
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=key)
+    start = (page - 1) * page_size
+    st.caption(f"Showing {start + 1}-{min(start + page_size, total)} of {total}")
+    return start, min(start + page_size, total)
+
+def sort_positions(values, descending=False):
+    """Stable ordering of `values` (a Series) as integer positions, blanks always last"""
+    if not (pd.api.types.is_numeric_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype)):
+        numbers = pd.to_numeric(values, errors='coerce')
+        if numbers.notna().sum() == values.notna().sum():
+            values = numbers
+        else:
+            values = values.astype(str).str.strip().str.lower().where(values.notna())
+    ordered = values.reset_index(drop=True).sort_values(ascending=not descending, kind='stable', na_position='last')
+    return ordered.index.to_numpy()
+
+def match_positions(df, *masks):
+    """Integer positions of the rows of `df` passing every mask; None masks are skipped"""
+    keep = np.ones(len(df), dtype=bool)
+    for mask in masks:
+        if mask is not None:
+            keep &= np.asarray(mask, dtype=bool)
+    return np.flatnonzero(keep)
+
+@st.cache_data(max_entries=FILTER_MEMO_SIZE, show_spinner=False)
+def cached_filter_result(scope, version, filters, _compute):
+    """LRU slot for one filter result; `_compute` is not part of the key"""
+    return _compute()
+
+def memo_filter(scope, version, filters, compute):
+    """Result of `compute()` memoized by listing scope, data version and filter widget state.
+
+    A sheet refresh gives the data a new version, so results from older data are never
+    served again and age out of the bounded cache. Frames without a version are not memoized.
+    """
+    if version is None:
+        return compute()
+    return cached_filter_result(scope, version, filters, compute)
+
+def render_listing(df, key, noun="records", sort_columns=(), rows=None, page_size=LISTING_PAGE_SIZE):
+    """Shared paged listing: a count-only summary, a sort key picker and a page picker.
+
+    `rows` optionally limits the listing to those integer positions of `df`, so callers can pass
+    filter results without building a filtered frame. Returns only the rows of the current page.
+    """
+    positions = np.arange(len(df)) if rows is None else np.asarray(rows, dtype=np.intp)
+    total = len(positions)
+    st.markdown(f"**Found {total} {noun}**")
+    if total == 0:
+        return df.iloc[0:0]
+    
+    sort_columns = [column for column in sort_columns if column in df.columns]
+    if sort_columns and total > 1:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            sort_by = st.selectbox("Sort by:", ["Sheet order"] + sort_columns, key=f"{key}_sort")
+        with col2:
+            descending = st.checkbox("Descending", key=f"{key}_descending")
+        if sort_by != "Sheet order":
+            positions = positions[sort_positions(df[sort_by].iloc[positions], descending)]
+        elif descending:
+            positions = positions[::-1]
+    
+    start, stop = paginate(total, page_size, key=f"{key}_page")
+    return df.iloc[positions[start:stop]]
+
 def format_time_ago(timestamp):
     """Format timestamp"""
     diff = datetime.now() - timestamp
@@ -695,15 +1887,18 @@ def client_orders_tab():
         st.warning("No clients available")
         return
     
+    # One version for the stores and the filter memo below - a refresh between two reads
+    # would otherwise cache masks of the old stores under the new version
+    orders_version = sheet_version("Clients_CoC")
     with st.spinner(f"Loading data for {client}..."):
-        DATA = get_google_sheets_data(client)
+        DATA = build_client_data(client, orders_version)
     
-    if not DATA.get("Backaldrin") and not DATA.get("Bateel"):
+    if not DATA["Backaldrin"]['offsets'] and not DATA["Bateel"]['offsets']:
         st.error(f"No data found for {client}")
         return
     
     supplier = st.radio("Select Supplier:", ["Backaldrin", "Bateel"], horizontal=True, key="client_orders_supplier")
-    supplier_data = DATA.get(supplier, {})
+    supplier_data = DATA[supplier]
     
     st.markdown("<div class='subsection-header'>🔍 Search Orders</div>", unsafe_allow_html=True)
     
@@ -711,7 +1906,8 @@ def client_orders_tab():
     with col1:
         search_term = st.text_input("Search by Article, Product, or HS Code:", placeholder="e.g., 1-366, Chocolate...", key="client_orders_search")
     with col2:
-        search_type = st.selectbox("Search Type:", ["All", "Article Number", "Product Name", "HS Code"], key="client_orders_search_type")
+        search_type = st.selectbox("Search Type:", ["All", "Article Number", "Product Name", "HS Code", "Similar Name"], key="client_orders_search_type",
+                                   help="Similar Name tolerates typos and ranks the closest product names first")
     with col3:
         if st.button("🔍 Search", type="primary", use_container_width=True, key="client_orders_search_btn"):
             if search_term:
@@ -726,15 +1922,8 @@ def client_orders_tab():
     end_date = None
     
     if filter_type == "Year":
-        available_years = set()
-        for article_num, article_data in supplier_data.items():
-            for order in article_data.get('orders', []):
-                year = order.get('year', '')
-                if year and year != 'nan':
-                    year_str = str(year).strip()
-                    if year_str.isdigit() and len(year_str) == 4:
-                        available_years.add(year_str)
-        available_years = sorted(list(available_years), reverse=True)
+        available_years = {str(year).strip() for year in supplier_data['orders']['year'].unique()}
+        available_years = sorted([year for year in available_years if year.isdigit() and len(year) == 4], reverse=True)
         if available_years:
             selected_year = st.selectbox("Select Year:", available_years, key="client_orders_year")
     
@@ -746,46 +1935,12 @@ def client_orders_tab():
             end_date = st.date_input("To Date:", value=datetime.now().date(), key="client_orders_end")
     
     if search_term:
-        search_results = []
-        search_lower = search_term.lower()
-        
-        for article_num, article_data in supplier_data.items():
-            match_found = False
-            match_type = ""
-            
-            if search_type in ["All", "Article Number"]:
-                if search_lower in article_num.lower():
-                    match_found = True
-                    match_type = "Article Number"
-            
-            if not match_found and search_type in ["All", "Product Name"]:
-                for name in article_data.get('names', []):
-                    if search_lower in str(name).lower():
-                        match_found = True
-                        match_type = "Product Name"
-                        break
-            
-            if not match_found and search_type in ["All", "HS Code"]:
-                for order in article_data.get('orders', []):
-                    hs_code = str(order.get('hs_code', '')).lower()
-                    if search_lower in hs_code:
-                        match_found = True
-                        match_type = "HS Code"
-                        break
-            
-            if match_found and article_data.get('orders'):
-                product_name = article_data['names'][0] if article_data.get('names') else ""
-                prices = article_data.get('prices', [])
-                
-                search_results.append({
-                    'article': article_num,
-                    'product_name': product_name,
-                    'match_type': match_type,
-                    'orders_count': len(article_data.get('orders', [])),
-                    'min_price': min(prices) if prices else None,
-                    'max_price': max(prices) if prices else None,
-                    'article_data': article_data
-                })
+        date_filter = (filter_type, selected_year, start_date, end_date)
+        search_results, order_mask = memo_filter(
+            "client_orders", (orders_version, sheet_version(PRODUCT_CATALOG_SHEET)), (client, supplier, search_term, search_type, date_filter),
+            lambda: (client_order_matches(supplier_data, client, supplier, search_term, search_type),
+                     order_date_mask(supplier_data['orders'], *date_filter))
+        )
         
         if search_results:
             st.success(f"Found {len(search_results)} matching items")
@@ -804,76 +1959,72 @@ def client_orders_tab():
             if all_prices:
                 col3.metric("Price Range", f"${min(all_prices):.2f} - ${max(all_prices):.2f}")
             
+            # The date filter is one mask over the supplier's whole order table,
+            # so per-article counts are differences of its running total
+            store_orders = supplier_data['orders']
+            filter_info = ""
+            if filter_type == "Year" and selected_year:
+                filter_info = f" | Year: {selected_year}"
+            elif filter_type == "Date Range" and start_date and end_date:
+                filter_info = f" | {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+            running_total = np.concatenate([[0], np.cumsum(order_mask)])
+            
+            summary_rows = []
             for result in search_results:
-                filtered_orders = result['article_data'].get('orders', []).copy()
-                
-                if filter_type == "Year" and selected_year:
-                    filtered_orders = []
-                    for order in result['article_data'].get('orders', []):
-                        order_year = order.get('year', '')
-                        if order_year and order_year != 'nan':
-                            year_str = str(order_year).strip()
-                            if year_str.isdigit() and len(year_str) == 4 and year_str == selected_year:
-                                filtered_orders.append(order)
-                        elif order.get('date', ''):
-                            date_str = str(order.get('date', '')).strip()
-                            for fmt in ['%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d']:
-                                try:
-                                    date_obj = datetime.strptime(date_str, fmt)
-                                    if str(date_obj.year) == selected_year:
-                                        filtered_orders.append(order)
-                                    break
-                                except:
-                                    continue
-                
-                elif filter_type == "Date Range" and start_date and end_date:
-                    filtered_orders = []
-                    for order in result['article_data'].get('orders', []):
-                        date_str = str(order.get('date', '')).strip()
-                        if date_str and date_str != 'nan':
-                            for fmt in ['%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d']:
-                                try:
-                                    date_obj = datetime.strptime(date_str, fmt)
-                                    if start_date <= date_obj.date() <= end_date:
-                                        filtered_orders.append(order)
-                                    break
-                                except:
-                                    continue
-                
-                filter_info = ""
-                if filter_type == "Year" and selected_year:
-                    filter_info = f" | Year: {selected_year}"
-                elif filter_type == "Date Range" and start_date and end_date:
-                    filter_info = f" | {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+                start, stop = supplier_data['offsets'][result['article']]
+                summary_rows.append({
+                    'Article': result['article'],
+                    'Product': result['product_name'],
+                    'Match': result['match_type'],
+                    'Orders': int(running_total[stop] - running_total[start]),
+                    'Total Orders': result['orders_count'],
+                    'Min Price': f"${result['min_price']:.2f}" if result['min_price'] else 'N/A',
+                    'Max Price': f"${result['max_price']:.2f}" if result['max_price'] else 'N/A'
+                })
+            summary = pd.DataFrame(summary_rows)
+            
+            page_start, page_stop = paginate(len(summary), CLIENT_ORDERS_PAGE_SIZE, key="client_orders_results_page")
+            page = summary.iloc[page_start:page_stop]
+            st.dataframe(page, use_container_width=True, hide_index=True)
+            
+            # Only the article picked from this page renders its order cards
+            selected_article = st.selectbox(
+                "Show orders for:", page['Article'].tolist(), key="client_orders_detail",
+                format_func=lambda article: f"📦 {article} - {page.loc[page['Article'] == article, 'Product'].iloc[0]}"
+            )
+            if selected_article:
+                start, stop = supplier_data['offsets'][selected_article]
+                filtered_orders = store_orders.iloc[start:stop][order_mask[start:stop]]
+                st.markdown(f"**{selected_article} | {len(filtered_orders)} orders{filter_info}**")
                 
-                with st.expander(f"📦 {result['article']} - {result['product_name']} | {len(filtered_orders)} orders{filter_info}", expanded=False):
-                    if not filtered_orders:
-                        st.info(f"No orders found in selected date range. Total orders available: {result['orders_count']}")
-                    else:
-                        for order in filtered_orders:
-                            price_display = order.get('price', 'N/A')
-                            try:
-                                price_val = float(str(price_display).replace('$', '').replace(',', '').strip())
-                                price_display = f"${price_val:.2f}"
-                            except:
-                                price_display = f"${price_display}" if price_display != 'N/A' else 'N/A'
-                            
-                            st.markdown(f"""
-                            <div class="price-card-primary" style="margin-bottom: 0.5rem;">
-                                <div style="display: flex; justify-content: space-between;">
-                                    <div>
-                                        <strong>Order:</strong> {order.get('order_no', 'N/A')}<br>
-                                        <strong>Date:</strong> {order.get('date', 'N/A')}
-                                    </div>
-                                    <div>
-                                        <strong>Price:</strong> {price_display}/kg
-                                    </div>
+                if filtered_orders.empty:
+                    st.info(f"No orders found in selected date range. Total orders available: {stop - start}")
+                else:
+                    card_start, card_stop = paginate(len(filtered_orders), CLIENT_ORDERS_CARD_BUDGET, key="client_orders_cards_page")
+                    for order in order_records(filtered_orders.iloc[card_start:card_stop]):
+                        price_display = order.get('price', 'N/A')
+                        try:
+                            price_val = float(str(price_display).replace('$', '').replace(',', '').strip())
+                            price_display = f"${price_val:.2f}"
+                        except:
+                            price_display = f"${price_display}" if price_display != 'N/A' else 'N/A'
+                        
+                        st.markdown(f"""
+                        <div class="price-card-primary" style="margin-bottom: 0.5rem;">
+                            <div style="display: flex; justify-content: space-between;">
+                                <div>
+                                    <strong>Order:</strong> {order.get('order_no', 'N/A')}<br>
+                                    <strong>Date:</strong> {order.get('date', 'N/A')}
                                 </div>
-                                <div style="margin-top: 0.5rem; font-size: 0.85rem; color: #64748b;">
-                                    {order.get('quantity', 'N/A')} units • {order.get('total_weight', 'N/A')} kg
+                                <div>
+                                    <strong>Price:</strong> {price_display}/kg
                                 </div>
                             </div>
-                            """, unsafe_allow_html=True)
+                            <div style="margin-top: 0.5rem; font-size: 0.85rem; color: #64748b;">
+                                {order.get('quantity', 'N/A')} units • {order.get('total_weight', 'N/A')} kg
+                            </div>
+                        </div>
+                        """, unsafe_allow_html=True)
         else:
             st.warning(f"No results found for '{search_term}'")
     else:
@@ -918,18 +2069,20 @@ def pricing_hub_tab():
             with col2:
                 search_price = st.text_input("Search by Item Code or Name:", placeholder="Enter article or product name...", key="hub_search")
             
-            filtered_data = prices_data.copy()
-            if selected_customer != "All":
-                filtered_data = filtered_data[filtered_data['Customer'] == selected_customer]
-            if search_price:
-                mask = filtered_data['Item Code'].astype(str).str.contains(search_price, case=False, na=False)
-                mask = mask | filtered_data['Item Name'].astype(str).str.contains(search_price, case=False, na=False)
-                filtered_data = filtered_data[mask]
+            def filter_prices():
+                customer_mask = prices_data['Customer'] == selected_customer if selected_customer != "All" else None
+                search_mask = None
+                if search_price:
+                    search_mask = prices_data['Item Code'].astype(str).str.contains(search_price, case=False, regex=False, na=False)
+                    search_mask = search_mask | prices_data['Item Name'].astype(str).str.contains(search_price, case=False, regex=False, na=False)
+                return match_positions(prices_data, customer_mask, search_mask)
             
-            st.markdown(f"**Found {len(filtered_data)} records**")
+            positions = memo_filter("customer_prices", prices_data.attrs.get('version'), (selected_customer, search_price), filter_prices)
             
-            if not filtered_data.empty:
-                for _, record in filtered_data.head(50).iterrows():
+            page = render_listing(prices_data, "hub_prices", rows=positions, noun="records", sort_columns=['Item Code', 'Item Name', 'Customer', 'Salesman', 'Price'])
+            
+            if not page.empty:
+                for _, record in page.iterrows():
                     with st.expander(f"💰 {record['Item Code']} - {record['Item Name']}", expanded=False):
                         col1, col2 = st.columns(2)
                         with col1:
@@ -941,9 +2094,6 @@ def pricing_hub_tab():
                             st.markdown(f"**Customer Article:** {record['Customer Article No']}")
                             st.markdown(f"**Packing:** {record['Packing/kg']} kg")
                             st.markdown(f"**Price:** <span style='font-size: 1.25rem; font-weight: 700; color: #059669;'>${record['Price']:.2f}</span>", unsafe_allow_html=True)
-                
-                if len(filtered_data) > 50:
-                    st.info(f"Showing 50 of {len(filtered_data)} records. Use filters to narrow down.")
     
     with sub_tab2:
         st.markdown("<div class='subsection-header'>📊 General Price List (All Items)</div>", unsafe_allow_html=True)
@@ -974,17 +2124,16 @@ def pricing_hub_tab():
                 else:
                     category_filter = "All"
             
-            filtered_general = general_data.copy()
-            if search_general:
-                mask = filtered_general.astype(str).apply(lambda x: x.str.contains(search_general, case=False, na=False)).any(axis=1)
-                filtered_general = filtered_general[mask]
-            if category_filter != "All" and 'CATEG.' in general_data.columns:
-                filtered_general = filtered_general[filtered_general['CATEG.'] == category_filter]
+            positions = memo_filter("general_prices", general_data.attrs.get('version'), (search_general, category_filter), lambda: match_positions(
+                general_data,
+                search_rows(general_data, search_general) if search_general else None,
+                general_data['CATEG.'] == category_filter if category_filter != "All" and 'CATEG.' in general_data.columns else None,
+            ))
             
-            st.markdown(f"**Found {len(filtered_general)} items**")
+            page = render_listing(general_data, "general_list", rows=positions, noun="items", sort_columns=['ART#', 'DESCRIPTION', 'CATEG.', 'NEW EXW'])
             
-            if not filtered_general.empty:
-                for _, item in filtered_general.head(30).iterrows():
+            if not page.empty:
+                for _, item in page.iterrows():
                     with st.expander(f"📦 {item.get('ART#', 'N/A')} - {item.get('DESCRIPTION', 'N/A')}", expanded=False):
                         col1, col2 = st.columns(2)
                         with col1:
@@ -1015,26 +2164,32 @@ def pricing_hub_tab():
                 if search_intel and selected_clients:
                     st.markdown(f"<div class='subsection-header'>Analysis Results: '{search_intel}'</div>", unsafe_allow_html=True)
                     
+                    # Load every selected client at once, reporting each one as it arrives
+                    client_datasets = {}
+                    progress = st.progress(0.0, text="Loading client order histories...")
+                    for client, client_data in load_concurrently({client: partial(get_google_sheets_data, client) for client in selected_clients}):
+                        client_datasets[client] = client_data
+                        progress.progress(len(client_datasets) / len(selected_clients), text=f"Loaded {client} ({len(client_datasets)}/{len(selected_clients)})")
+                    progress.empty()
+                    
                     all_results = []
                     for client in selected_clients:
-                        client_data = get_google_sheets_data(client)
+                        client_data = client_datasets[client]
                         
                         for supplier in ["Backaldrin", "Bateel"]:
-                            supplier_data = client_data.get(supplier, {})
+                            supplier_data = client_data[supplier]
                             
-                            for article_num, article_data in supplier_data.items():
-                                article_match = search_intel.lower() in article_num.lower()
-                                product_match = any(search_intel.lower() in name.lower() for name in article_data.get('names', []))
-                                
-                                if article_match or product_match:
-                                    prices = article_data.get('prices', [])
+                            for article_num in search_articles(client, supplier, search_intel, ('article', 'names')):
+                                if article_num in supplier_data['offsets']:
+                                    names = supplier_data['names'][article_num]
+                                    prices = article_orders(supplier_data, article_num)['price_value'].dropna()
                                     all_results.append({
                                         'Client': client,
                                         'Supplier': supplier,
                                         'Article': article_num,
-                                        'Product': article_data.get('names', ['N/A'])[0],
-                                        'Min Price': f"${min(prices):.2f}" if prices else 'N/A',
-                                        'Max Price': f"${max(prices):.2f}" if prices else 'N/A',
+                                        'Product': names[0] if names else 'N/A',
+                                        'Min Price': f"${prices.min():.2f}" if not prices.empty else 'N/A',
+                                        'Max Price': f"${prices.max():.2f}" if not prices.empty else 'N/A',
                                         'Records': len(prices)
                                     })
                     
@@ -1090,10 +2245,12 @@ def special_prices_tab():
         st.warning(f"No CEO special prices found for {client}")
         return
     
+    today = pd.Timestamp(datetime.now().date())
+    
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("Total Special Offers", len(special_data))
     if 'Expiry_Date' in special_data.columns:
-        active_count = len(special_data[special_data['Expiry_Date'] >= datetime.now().strftime('%Y-%m-%d')])
+        active_count = len(special_data[special_data['Expiry_Date'] >= today])
         col2.metric("Active Offers", active_count)
     col3.metric("Currencies", special_data['Currency'].nunique())
     
@@ -1103,18 +2260,17 @@ def special_prices_tab():
     with col2:
         show_active = st.checkbox("Show Active Only", value=True, key="special_active")
     
-    filtered_special = special_data.copy()
-    if search_special:
-        mask = filtered_special.astype(str).apply(lambda x: x.str.contains(search_special, case=False, na=False)).any(axis=1)
-        filtered_special = filtered_special[mask]
-    if show_active and 'Expiry_Date' in filtered_special.columns:
-        filtered_special = filtered_special[filtered_special['Expiry_Date'] >= datetime.now().strftime('%Y-%m-%d')]
+    positions = match_positions(
+        special_data,
+        search_rows(special_data, search_special) if search_special else None,
+        special_data['Expiry_Date'] >= today if show_active and 'Expiry_Date' in special_data.columns else None,
+    )
     
-    st.markdown(f"**Found {len(filtered_special)} special offers**")
+    page = render_listing(special_data, "special_list", noun="special offers", sort_columns=['Article_Number', 'Product_Name', 'Expiry_Date'], rows=positions)
     
-    if not filtered_special.empty:
-        for _, special in filtered_special.iterrows():
-            is_active = special['Expiry_Date'] >= datetime.now().strftime('%Y-%m-%d') if 'Expiry_Date' in special else True
+    if not page.empty:
+        for _, special in page.iterrows():
+            is_active = special['Expiry_Date'] >= today if 'Expiry_Date' in special else True
             status = "🟢 Active" if is_active else "🔴 Expired"
             
             try:
@@ -1177,17 +2333,16 @@ def products_logistics_tab():
                 else:
                     supplier_filter = "All"
             
-            filtered_catalog = catalog_data.copy()
-            if search_catalog:
-                mask = filtered_catalog.astype(str).apply(lambda x: x.str.contains(search_catalog, case=False, na=False)).any(axis=1)
-                filtered_catalog = filtered_catalog[mask]
-            if supplier_filter != "All" and 'Supplier' in catalog_data.columns:
-                filtered_catalog = filtered_catalog[filtered_catalog['Supplier'] == supplier_filter]
+            positions = match_positions(
+                catalog_data,
+                search_rows(catalog_data, search_catalog) if search_catalog else None,
+                catalog_data['Supplier'] == supplier_filter if supplier_filter != "All" and 'Supplier' in catalog_data.columns else None,
+            )
             
-            st.markdown(f"**Found {len(filtered_catalog)} products**")
+            page = render_listing(catalog_data, "catalog_list", rows=positions, noun="products", sort_columns=['Article_Number', 'Product_Name', 'Supplier', 'Category'])
             
-            if not filtered_catalog.empty:
-                for _, product in filtered_catalog.head(30).iterrows():
+            if not page.empty:
+                for _, product in page.iterrows():
                     with st.expander(f"📦 {product['Article_Number']} - {product['Product_Name']}", expanded=False):
                         product_tab1, product_tab2, product_tab3 = st.tabs(["📋 Details", "📄 Datasheet", "📊 Specifications"])
                         
@@ -1260,9 +2415,6 @@ def products_logistics_tab():
                             with col2:
                                 if 'Supplier' in product and product['Supplier']:
                                     st.markdown(f"**Supplier:** {product['Supplier']}")
-                
-                if len(filtered_catalog) > 30:
-                    st.info(f"Showing 30 of {len(filtered_catalog)} products. Use filters to narrow down.")
     
     with sub_tab2:
         st.markdown("<div class='subsection-header'>📦 Quick Pallet Calculator</div>", unsafe_allow_html=True)
@@ -1343,18 +2495,6 @@ def products_logistics_tab():
 def order_tracking_tab():
     """Consolidated Order Tracking - Updated with Date Range Filter"""
     
-    # Helper function to parse ETD dates (DD.MM.YYYY format)
-    def parse_etd_date(date_str):
-        if not date_str or pd.isna(date_str) or str(date_str).strip() == '':
-            return None
-        # Try DD.MM.YYYY first (your primary format)
-        for fmt in ['%d.%m.%Y', '%d.%m.%y', '%d/%m/%Y', '%d/%m/%y', '%d-%m-%Y', '%d-%m-%y', '%Y-%m-%d', '%Y/%m/%d']:
-            try:
-                return datetime.strptime(str(date_str).strip(), fmt).date()
-            except:
-                continue
-        return None
-    
     st.markdown("""
     <div style="background: linear-gradient(135deg, #059669, #047857); padding: 1.25rem; border-radius: 12px; margin-bottom: 1.5rem;">
         <h2 style="margin:0; color: white;">📅 Order Tracking</h2>
@@ -1367,18 +2507,28 @@ def order_tracking_tab():
     with sub_tab1:
         st.markdown("<div class='subsection-header'>🚢 ETD Dashboard</div>", unsafe_allow_html=True)
         
-        AVAILABLE_MONTHS = ["May 2026", "June 2026"]
-        
-        selected_month = st.selectbox("Select Month:", AVAILABLE_MONTHS, key="etd_month")
-        
-        with st.spinner(f"Loading {selected_month} ETD data..."):
-            etd_data = load_etd_data(ETD_SHEET_ID, selected_month)
-        
-        if etd_data.empty:
-            st.warning(f"No ETD data found for {selected_month}")
+        etd_months = discover_etd_months()
+        open_months = [month for month in etd_months if is_open_etd_month(month)]
+        selected_months = st.multiselect("Select Months:", etd_months, default=open_months or etd_months[-1:], key="etd_months")
+        selected_months = [month for month in etd_months if month in selected_months]
+        months_label = selected_months[0] if len(selected_months) == 1 else f"{len(selected_months)} months"
+        
+        # The ETD months and the catalog behind Samples Request live in different
+        # spreadsheets - fetch them side by side
+        loaders = {'catalog': load_product_catalog}
+        if selected_months:
+            loaders['etd'] = partial(load_etd_table, selected_months)
+        with st.spinner(f"Loading {months_label} ETD data..."):
+            loaded = dict(load_concurrently(loaders))
+        etd_data = loaded.get('etd', pd.DataFrame())
+        
+        if not selected_months:
+            st.info("Select at least one month to load its ETD orders")
+        elif etd_data.empty:
+            st.warning(f"No ETD data found for {months_label}")
             st.info("💡 Make sure the sheet exists and has headers in row 14 (A14).")
         else:
-            st.success(f"✅ Loaded {len(etd_data)} orders for {selected_month}")
+            st.success(f"✅ Loaded {len(etd_data)} orders for {months_label}")
             
             # Summary metrics
             col1, col2, col3, col4 = st.columns(4)
@@ -1441,35 +2591,31 @@ def order_tracking_tab():
                     date_column_to_filter = 'Confirmation Date'
             
             # Apply filters
-            filtered_etd = etd_data.copy()
-            if client_filter != "All" and 'Client Name' in etd_data.columns:
-                filtered_etd = filtered_etd[filtered_etd['Client Name'] == client_filter]
-            if status_filter != "All" and 'Status' in etd_data.columns:
-                filtered_etd = filtered_etd[filtered_etd['Status'] == status_filter]
+            def filter_etd():
+                client_mask = etd_data['Client Name'] == client_filter if client_filter != "All" and 'Client Name' in etd_data.columns else None
+                status_mask = etd_data['Status'] == status_filter if status_filter != "All" and 'Status' in etd_data.columns else None
+                date_mask = None
+                if date_filter_type != "All Dates" and start_date and end_date and date_column_to_filter in etd_data.columns:
+                    date_mask = frame_dates(etd_data, date_column_to_filter).between(pd.Timestamp(start_date), pd.Timestamp(end_date))
+                return match_positions(etd_data, client_mask, status_mask, date_mask)
+            
+            date_filter = (date_filter_type, start_date, end_date)
+            positions = memo_filter("etd", etd_data.attrs.get('version'), (client_filter, status_filter, date_filter), filter_etd)
             
             # Apply date filter if enabled
             if date_filter_type != "All Dates" and start_date and end_date and date_column_to_filter:
-                if date_column_to_filter in filtered_etd.columns:
-                    filtered_indices = []
-                    for idx, row in filtered_etd.iterrows():
-                        date_str = row.get(date_column_to_filter, '')
-                        parsed_date = parse_etd_date(date_str)
-                        if parsed_date and start_date <= parsed_date <= end_date:
-                            filtered_indices.append(idx)
-                    
-                    if filtered_indices:
-                        filtered_etd = filtered_etd.loc[filtered_indices]
-                        st.info(f"📅 Filtered by {date_column_to_filter}: {start_date.strftime('%d.%m.%Y')} to {end_date.strftime('%d.%m.%Y')} - Found {len(filtered_etd)} orders")
+                if date_column_to_filter in etd_data.columns:
+                    if len(positions):
+                        st.info(f"📅 Filtered by {date_column_to_filter}: {start_date.strftime('%d.%m.%Y')} to {end_date.strftime('%d.%m.%Y')} - Found {len(positions)} orders")
                     else:
-                        filtered_etd = filtered_etd.iloc[0:0]  # Empty dataframe
                         st.warning(f"No orders found in selected date range for {date_column_to_filter}")
                 else:
                     st.warning(f"Column '{date_column_to_filter}' not found in the data")
             
-            st.markdown(f"**Found {len(filtered_etd)} orders**")
+            page = render_listing(etd_data, "etd_list", rows=positions, noun="orders", sort_columns=['Month', 'Order No.', 'Client Name', 'Status', 'Concerned Employee'])
             
-            if not filtered_etd.empty:
-                for idx, order in filtered_etd.iterrows():
+            if not page.empty:
+                for idx, order in page.iterrows():
                     status = order.get('Status', 'Unknown')
                     status_icon = {
                         'Shipped': '🟢', 
@@ -1489,6 +2635,7 @@ def order_tracking_tab():
                             st.markdown(f"**Employee:** {order.get('Concerned Employee', 'N/A')}")
                             st.markdown(f"**Order No.:** {order_no}")
                         with col2:
+                            st.markdown(f"**Month:** {order.get('Month', 'N/A')}")
                             st.markdown(f"**Status:** {status}")
                             st.markdown(f"**Confirmation Date:** {order.get('Confirmation Date', 'N/A')}")
                             st.markdown(f"**Loading Date:** {order.get('Scheduled Date For Loading', 'N/A')}")
@@ -1523,11 +2670,11 @@ def order_tracking_tab():
                             st.markdown("---")
                             st.markdown(f"**📄 Chick List Doc:** {chick_list}")
                 
-                csv_data = filtered_etd.to_csv(index=False, encoding='utf-8-sig')
+                csv_data = etd_data.iloc[positions].to_csv(index=False, encoding='utf-8-sig')
                 st.download_button(
                     label="📥 Export ETD Data to CSV",
                     data=csv_data.encode('utf-8-sig'),
-                    file_name=f"etd_{selected_month}_{datetime.now().strftime('%Y%m%d')}.csv",
+                    file_name=f"etd_{selected_months[0]}{'' if len(selected_months) == 1 else '_to_' + selected_months[-1]}_{datetime.now().strftime('%Y%m%d')}.csv",
                     mime="text/csv",
                     use_container_width=True
                 )
@@ -1540,7 +2687,7 @@ def order_tracking_tab():
         if 'sample_items' not in st.session_state:
             st.session_state.sample_items = []
         
-        catalog_data = load_product_catalog()
+        catalog_data = loaded['catalog']
         article_to_product = {}
         
         if not catalog_data.empty and 'Article_Number' in catalog_data.columns and 'Product_Name' in catalog_data.columns:
@@ -1684,18 +2831,15 @@ def price_tracking_tab():
                 suppliers_to_check = [selected_supplier]
             
             for supplier in suppliers_to_check:
-                supplier_data = client_data.get(supplier, {})
+                supplier_data = client_data[supplier]
                 
-                for article_num, article_data in supplier_data.items():
-                    article_match = search_item.lower() in article_num.lower()
-                    product_match = any(search_item.lower() in name.lower() for name in article_data.get('names', []))
-                    
-                    if article_match or product_match:
-                        product_name = article_data.get('names', ['N/A'])[0]
+                for article_num in search_articles(selected_client, supplier, search_item, ('article', 'names')):
+                    if article_num in supplier_data['offsets']:
+                        names = supplier_data['names'][article_num]
+                        product_name = names[0] if names else 'N/A'
                         
-                        for order in article_data.get('orders', []):
+                        for order in order_records(article_orders(supplier_data, article_num)):
                             price_str = order.get('price', '')
-                            date_str = order.get('date', '')
                             
                             price_value = None
                             try:
@@ -1708,32 +2852,17 @@ def price_tracking_tab():
                             month = None
                             quarter = None
                             
+                            parsed_date = order.get('order_date')
                             year_str = order.get('year', '')
                             if year_str and year_str != 'nan':
                                 try:
                                     year = int(str(year_str).strip())
-                                    if date_str and date_str != 'nan':
-                                        for fmt in ['%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d']:
-                                            try:
-                                                date_obj = datetime.strptime(str(date_str).strip(), fmt)
-                                                month = date_obj.month
-                                                order_date = date_obj
-                                                break
-                                            except:
-                                                continue
                                 except:
                                     pass
-                            
-                            if not year and date_str and date_str != 'nan':
-                                for fmt in ['%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d']:
-                                    try:
-                                        date_obj = datetime.strptime(str(date_str).strip(), fmt)
-                                        year = date_obj.year
-                                        month = date_obj.month
-                                        order_date = date_obj
-                                        break
-                                    except:
-                                        continue
+                            if parsed_date:
+                                year = year or parsed_date.year
+                                month = parsed_date.month
+                                order_date = datetime.combine(parsed_date, datetime.min.time())
                             
                             if year:
                                 if month:
@@ -2314,38 +3443,36 @@ def client_details_tab():
     with col3:
         show_complete_only = st.checkbox("Show Complete Info Only", value=False, help="Show only clients with all major fields filled")
     
-    filtered_df = client_details_df.copy()
-    
-    if search_term:
-        search_lower = search_term.lower()
-        mask = filtered_df.astype(str).apply(lambda x: x.str.contains(search_lower, case=False, na=False)).any(axis=1)
-        filtered_df = filtered_df[mask]
-    
-    if country_filter != "All" and country_col:
-        filtered_df = filtered_df[filtered_df[country_col] == country_filter]
-    
+    complete_mask = None
     if show_complete_only:
         major_fields = []
-        for col in filtered_df.columns:
+        for col in client_details_df.columns:
             if any(keyword in col.lower() for keyword in ['name', 'email', 'phone', 'address', 'contact']):
                 major_fields.append(col)
         
         if major_fields:
-            for field in major_fields:
-                filtered_df = filtered_df[filtered_df[field].notna()]
+            complete_mask = client_details_df[major_fields].notna().all(axis=1)
     
-    st.markdown(f"### 📋 Client Directory ({len(filtered_df)} clients)")
+    positions = match_positions(
+        client_details_df,
+        search_rows(client_details_df, search_term) if search_term else None,
+        client_details_df[country_col] == country_filter if country_filter != "All" and country_col else None,
+        complete_mask,
+    )
     
-    if not filtered_df.empty:
+    st.markdown(f"### 📋 Client Directory ({len(positions)} clients)")
+    
+    if len(positions):
         view_type = st.radio("View as:", ["Cards", "Table"], horizontal=True, key="client_view_type")
         
         if view_type == "Cards":
             cols_per_row = 3
-            for i in range(0, len(filtered_df), cols_per_row):
+            page_start, page_stop = paginate(len(positions), LISTING_PAGE_SIZE, key="client_cards_page")
+            for i in range(page_start, page_stop, cols_per_row):
                 cols = st.columns(cols_per_row)
                 for j in range(cols_per_row):
-                    if i + j < len(filtered_df):
-                        client = filtered_df.iloc[i + j]
+                    if i + j < page_stop:
+                        client = client_details_df.iloc[positions[i + j]]
                         with cols[j]:
                             name_col = next((col for col in client.index if 'name' in col.lower() or 'Name' in col), None)
                             client_name = client[name_col] if name_col and pd.notna(client[name_col]) else f"Client {i+j+1}"
@@ -2365,16 +3492,16 @@ def client_details_tab():
                             st.markdown("---")
         else:
             important_cols = []
-            for col in filtered_df.columns:
+            for col in client_details_df.columns:
                 if any(keyword in col.lower() for keyword in ['name', 'contact', 'email', 'phone', 'mobile', 'address', 'country', 'city']):
                     important_cols.append(col)
             
             if not important_cols:
-                important_cols = filtered_df.columns.tolist()
+                important_cols = client_details_df.columns.tolist()
             
             display_cols = important_cols[:10]
             
-            display_df = filtered_df[display_cols].copy()
+            display_df = client_details_df.iloc[positions, client_details_df.columns.get_indexer(display_cols)]
             display_df = display_df.fillna('')
             display_df.columns = [col.replace('_', ' ').title() for col in display_df.columns]
             
@@ -2387,7 +3514,7 @@ def client_details_tab():
     col1, col2 = st.columns(2)
     with col1:
         if st.button("📥 Export Client Details to CSV", use_container_width=True):
-            csv_data = filtered_df.to_csv(index=False, encoding='utf-8-sig')
+            csv_data = client_details_df.iloc[positions].to_csv(index=False, encoding='utf-8-sig')
             st.download_button(
                 label="Download CSV",
                 data=csv_data.encode('utf-8-sig'),
@@ -2440,17 +3567,6 @@ def price_checker_tab():
         st.warning("No clients available. Please check your Clients_CoC sheet.")
         return
     
-    # Helper function to parse dates properly
-    def parse_date(date_str):
-        if not date_str or date_str == 'nan' or str(date_str).strip() == '':
-            return None
-        for fmt in ['%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%y', '%d/%m/%y', '%Y/%m/%d']:
-            try:
-                return datetime.strptime(str(date_str).strip(), fmt).date()
-            except:
-                continue
-        return None
-    
     col1, col2 = st.columns([1, 2])
     
     with col1:
@@ -2459,13 +3575,6 @@ def price_checker_tab():
     with col2:
         selected_client = st.selectbox("Select Client:", available_clients, key="price_checker_client")
     
-    # Currency symbol mapping
-    currency_symbols = {
-        "USD": "$",
-        "EUR": "€",
-        "SAR": "ر.س"
-    }
-    
     if search_mode == "🔍 Search Specific Item":
         col1, col2 = st.columns([2, 1])
         with col1:
@@ -2474,6 +3583,7 @@ def price_checker_tab():
                                         key="price_checker_search")
         with col2:
             search_supplier = st.selectbox("Supplier:", ["Both", "Backaldrin", "Bateel"], key="price_checker_supplier")
+        fuzzy_search = st.checkbox("Typo-tolerant search (closest product names first)", key="price_checker_fuzzy")
         
         if search_term:
             with st.spinner(f"Searching for '{search_term}' in {selected_client}..."):
@@ -2488,67 +3598,57 @@ def price_checker_tab():
                     suppliers_to_check = [search_supplier]
                 
                 for supplier in suppliers_to_check:
-                    supplier_data = client_data.get(supplier, {})
+                    supplier_data = client_data[supplier]
                     
-                    for article_num, article_data in supplier_data.items():
-                        article_match = search_term.lower() in article_num.lower()
-                        product_match = any(search_term.lower() in name.lower() for name in article_data.get('names', []))
-                        
-                        if article_match or product_match:
-                            orders = article_data.get('orders', [])
-                            if orders:
-                                # Find the order with the latest date using proper date parsing
-                                latest_order = None
-                                latest_date = None
-                                
-                                for order in orders:
-                                    order_date = parse_date(order.get('date', ''))
-                                    if order_date:
-                                        if latest_date is None or order_date > latest_date:
-                                            latest_date = order_date
-                                            latest_order = order
-                                
-                                if latest_order is None and orders:
-                                    latest_order = orders[0]
-                                    latest_date = latest_order.get('date', 'Unknown')
-                                
-                                if latest_order:
-                                    price_value = latest_order.get('price_value')
-                                    currency = latest_order.get('currency', 'USD')
-                                    latest_date_str = latest_order.get('date', 'Unknown')
-                                    symbol = currency_symbols.get(currency, "$")
-                                    hs_code = latest_order.get('hs_code', 'N/A')
-                                    packaging = latest_order.get('packaging', 'N/A')
-                                    
-                                    if price_value:
-                                        latest_price_display = f"{symbol}{price_value:.2f}"
-                                    else:
-                                        latest_price_display = latest_order.get('price', 'N/A')
-                                    
-                                    # Get price history
-                                    price_history = []
-                                    for p in article_data.get('prices_with_currency', []):
-                                        sym = currency_symbols.get(p['currency'], "$")
-                                        price_history.append(f"{sym}{p['value']:.2f}")
-                                    
-                                    results.append({
-                                        'Article': article_num,
-                                        'Product Name': article_data.get('names', ['N/A'])[0],
-                                        'HS Code': hs_code,
-                                        'Packaging': packaging,
-                                        'Supplier': supplier,
-                                        'Latest Price': latest_price_display,
-                                        'Currency': currency,
-                                        'Last Order Date': latest_date_str,
-                                        'Total Orders': len(orders),
-                                        'Price History': price_history
-                                    })
+                    if fuzzy_search:
+                        matches = dict(fuzzy_search_articles(selected_client, supplier, search_term))
+                    else:
+                        matches = search_articles(selected_client, supplier, search_term, ('article', 'names'))
+                    
+                    for article_num in matches:
+                        orders = article_orders(supplier_data, article_num)
+                        if not orders.empty:
+                            latest_order = latest_article_order(supplier_data, article_num)
+                            price_value = latest_order.get('price_value')
+                            currency = latest_order.get('currency', 'USD')
+                            latest_date_str = latest_order.get('date', 'Unknown')
+                            symbol = CURRENCY_SYMBOLS.get(currency, "$")
+                            hs_code = latest_order.get('hs_code', 'N/A')
+                            packaging = latest_order.get('packaging', 'N/A')
+                            
+                            if price_value:
+                                latest_price_display = f"{symbol}{price_value:.2f}"
+                            else:
+                                latest_price_display = latest_order.get('price', 'N/A')
+                            
+                            # Get price history
+                            priced = orders[orders['price_value'].notna()]
+                            price_history = [f"{CURRENCY_SYMBOLS.get(cur, '$')}{value:.2f}" for value, cur in zip(priced['price_value'], priced['currency'])]
+                            names = supplier_data['names'][article_num]
+                            
+                            results.append({
+                                'Article': article_num,
+                                'Product Name': names[0] if names else 'N/A',
+                                'HS Code': hs_code,
+                                'Packaging': packaging,
+                                'Supplier': supplier,
+                                'Latest Price': latest_price_display,
+                                'Currency': currency,
+                                'Last Order Date': latest_date_str,
+                                'Total Orders': len(orders),
+                                'Price History': price_history,
+                                'Match Score': matches[article_num] if fuzzy_search else None
+                            })
+                
+                if fuzzy_search:
+                    results.sort(key=lambda r: r['Match Score'], reverse=True)
                 
                 if results:
                     st.success(f"✅ Found {len(results)} matching items")
                     
                     for result in results:
-                        with st.expander(f"📦 {result['Article']} - {result['Product Name']}", expanded=False):
+                        match_label = f" • {result['Match Score']:.0%} match" if result['Match Score'] is not None else ""
+                        with st.expander(f"📦 {result['Article']} - {result['Product Name']}{match_label}", expanded=False):
                             col1, col2 = st.columns(2)
                             with col1:
                                 st.markdown(f"**Article Number:** {result['Article']}")
@@ -2574,77 +3674,24 @@ def price_checker_tab():
     
     else:  # Show All Items
         with st.spinner(f"Loading all items for {selected_client}..."):
-            client_data = get_google_sheets_data(selected_client)
-            
-            all_items = []
-            
-            for supplier in ["Backaldrin", "Bateel"]:
-                supplier_data = client_data.get(supplier, {})
-                
-                for article_num, article_data in supplier_data.items():
-                    orders = article_data.get('orders', [])
-                    if orders:
-                        # Find the order with the latest date using proper date parsing
-                        latest_order = None
-                        latest_date = None
-                        
-                        for order in orders:
-                            order_date = parse_date(order.get('date', ''))
-                            if order_date:
-                                if latest_date is None or order_date > latest_date:
-                                    latest_date = order_date
-                                    latest_order = order
-                        
-                        if latest_order is None and orders:
-                            latest_order = orders[0]
-                        
-                        if latest_order:
-                            price_value = latest_order.get('price_value')
-                            currency = latest_order.get('currency', 'USD')
-                            latest_date_str = latest_order.get('date', 'Unknown')
-                            symbol = currency_symbols.get(currency, "$")
-                            hs_code = latest_order.get('hs_code', 'N/A')
-                            packaging = latest_order.get('packaging', 'N/A')
-                            
-                            if price_value:
-                                latest_price_display = price_value
-                                latest_price_formatted = f"{symbol}{price_value:.2f}"
-                            else:
-                                latest_price_display = 0
-                                latest_price_formatted = latest_order.get('price', 'N/A')
-                            
-                            all_items.append({
-                                'Article': article_num,
-                                'Product Name': article_data.get('names', ['N/A'])[0],
-                                'HS Code': hs_code,
-                                'Packaging': packaging,
-                                'Supplier': supplier,
-                                'Latest Price': latest_price_display,
-                                'Latest Price Formatted': latest_price_formatted,
-                                'Currency': currency,
-                                'Last Order Date': latest_date_str,
-                                'Total Orders': len(orders)
-                            })
+            df = get_latest_prices_table(selected_client)
             
-            if all_items:
-                df = pd.DataFrame(all_items)
-                df = df.sort_values('Latest Price', ascending=False)
-                
+            if not df.empty:
                 st.success(f"✅ Loaded {len(df)} items with prices")
                 
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
                     st.metric("Total Items", len(df))
                 with col2:
-                    usd_prices = [item['Latest Price'] for item in all_items if item['Currency'] == 'USD' and item['Latest Price'] > 0]
-                    if usd_prices:
-                        st.metric("Avg Price (USD only)", f"${sum(usd_prices)/len(usd_prices):.2f}")
+                    usd_prices = df.loc[(df['Currency'] == 'USD') & (df['Latest Price'] > 0), 'Latest Price']
+                    if not usd_prices.empty:
+                        st.metric("Avg Price (USD only)", f"${usd_prices.mean():.2f}")
                     else:
                         st.metric("Avg Price", "Multiple currencies")
                 with col3:
-                    st.metric("USD Items", len([i for i in all_items if i['Currency'] == 'USD']))
+                    st.metric("USD Items", int((df['Currency'] == 'USD').sum()))
                 with col4:
-                    st.metric("EUR/SAR Items", len([i for i in all_items if i['Currency'] in ['EUR', 'SAR']]))
+                    st.metric("EUR/SAR Items", int(df['Currency'].isin(['EUR', 'SAR']).sum()))
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -2652,22 +3699,21 @@ def price_checker_tab():
                 with col2:
                     supplier_filter = st.selectbox("Filter by Supplier:", ["All", "Backaldrin", "Bateel"], key="price_checker_supplier_filter")
                 
-                filtered_df = df.copy()
+                search_mask = None
                 if search_filter:
-                    mask = filtered_df['Article'].astype(str).str.contains(search_filter, case=False, na=False)
-                    mask = mask | filtered_df['Product Name'].astype(str).str.contains(search_filter, case=False, na=False)
-                    filtered_df = filtered_df[mask]
-                if supplier_filter != "All":
-                    filtered_df = filtered_df[filtered_df['Supplier'] == supplier_filter]
+                    search_mask = df['Article'].astype(str).str.contains(search_filter, case=False, regex=False, na=False)
+                    search_mask = search_mask | df['Product Name'].astype(str).str.contains(search_filter, case=False, regex=False, na=False)
+                positions = match_positions(df, search_mask, df['Supplier'] == supplier_filter if supplier_filter != "All" else None)
                 
-                st.markdown(f"**Showing {len(filtered_df)} items**")
+                st.markdown(f"**Showing {len(positions)} items**")
                 
-                display_df = filtered_df[['Article', 'Product Name', 'HS Code', 'Packaging', 'Supplier', 'Latest Price Formatted', 'Currency', 'Last Order Date', 'Total Orders']].copy()
-                display_df.columns = ['Article', 'Product Name', 'HS Code', 'Packaging', 'Supplier', 'Latest Price', 'Currency', 'Last Order Date', 'Total Orders']
+                export_cols = ['Article', 'Product Name', 'HS Code', 'Packaging', 'Supplier', 'Latest Price Formatted', 'Currency', 'Last Order Date', 'Total Orders']
+                export_df = df.iloc[positions, df.columns.get_indexer(export_cols)]
+                display_df = export_df.set_axis(['Article', 'Product Name', 'HS Code', 'Packaging', 'Supplier', 'Latest Price', 'Currency', 'Last Order Date', 'Total Orders'], axis=1)
                 
                 st.dataframe(display_df, use_container_width=True, hide_index=True)
                 
-                csv_data = filtered_df[['Article', 'Product Name', 'HS Code', 'Packaging', 'Supplier', 'Latest Price Formatted', 'Currency', 'Last Order Date', 'Total Orders']].to_csv(index=False, encoding='utf-8-sig')
+                csv_data = export_df.to_csv(index=False, encoding='utf-8-sig')
                 st.download_button(
                     label="📥 Export All Prices to CSV",
                     data=csv_data.encode('utf-8-sig'),
@@ -2704,24 +3750,6 @@ def sales_history_tab():
     with col2:
         search_type = st.radio("Select by:", ["Article Number", "Product Name"], horizontal=True, key="sales_history_search_type")
     
-    # Helper function to parse dates
-    def parse_date(date_str):
-        if not date_str or date_str == 'nan' or str(date_str).strip() == '':
-            return None
-        for fmt in ['%d.%m.%Y', '%d/%m/%Y', '%d-%m-%Y', '%Y-%m-%d', '%d.%m.%y', '%d/%m/%y', '%Y/%m/%d']:
-            try:
-                return datetime.strptime(str(date_str).strip(), fmt).date()
-            except:
-                continue
-        return None
-    
-    # Currency symbol mapping
-    currency_symbols = {
-        "USD": "$",
-        "EUR": "€",
-        "SAR": "ر.س"
-    }
-    
     if selected_client:
         with st.spinner(f"Loading items for {selected_client}..."):
             client_data = get_google_sheets_data(selected_client)
@@ -2729,9 +3757,8 @@ def sales_history_tab():
             # Build list of available items
             items_list = []
             for supplier in ["Backaldrin", "Bateel"]:
-                supplier_data = client_data.get(supplier, {})
-                for article_num, article_data in supplier_data.items():
-                    product_name = article_data.get('names', ['N/A'])[0]
+                for article_num, names in client_data[supplier]['names'].items():
+                    product_name = names[0] if names else 'N/A'
                     if product_name and product_name != 'N/A' and product_name != 'nan':
                         items_list.append({
                             'article': article_num,
@@ -2772,31 +3799,26 @@ def sales_history_tab():
                 item_data = None
                 item_supplier = None
                 for supplier in ["Backaldrin", "Bateel"]:
-                    supplier_data = client_data.get(supplier, {})
-                    if selected_article in supplier_data:
-                        item_data = supplier_data[selected_article]
+                    supplier_data = client_data[supplier]
+                    if selected_article in supplier_data['offsets']:
+                        item_data = supplier_data
                         item_supplier = supplier
                         break
                 
                 if item_data:
-                    product_name = item_data.get('names', ['N/A'])[0]
+                    names = item_data['names'][selected_article]
+                    product_name = names[0] if names else 'N/A'
                     
                     st.markdown(f"### 📊 Sales History: {selected_article} - {product_name}")
                     st.markdown(f"**Supplier:** {item_supplier} | **Client:** {selected_client}")
                     
                     # Filter orders by date range
-                    filtered_orders = []
-                    for order in item_data.get('orders', []):
-                        date_str = order.get('date', '')
-                        if date_str and date_str != 'nan':
-                            date_obj = parse_date(date_str)
-                            if date_obj and start_date <= date_obj <= end_date:
-                                order['parsed_date'] = date_obj
-                                filtered_orders.append(order)
+                    orders = article_orders(item_data, selected_article)
+                    in_range = orders[orders['order_date'].between(pd.Timestamp(start_date), pd.Timestamp(end_date))]
+                    # Sort by date
+                    filtered_orders = order_records(in_range.sort_values('order_date', kind='stable'))
                     
                     if filtered_orders:
-                        # Sort by date
-                        filtered_orders = sorted(filtered_orders, key=lambda x: x.get('parsed_date', datetime.min.date()))
                         
                         # Summary statistics
                         total_quantity = 0
@@ -2892,12 +3914,12 @@ def sales_history_tab():
                             
                             if price_value and price_value > 0:
                                 chart_data.append({
-                                    'Date': order.get('parsed_date'),
+                                    'Date': order.get('order_date'),
                                     'Price': price_value,
                                     'Currency': currency,
                                     'Weight (kg)': weight_val,
                                     'Order #': order.get('order_no', 'N/A'),
-                                    'Price Label': f"{currency_symbols.get(currency, '$')}{price_value:.2f}"
+                                    'Price Label': f"{CURRENCY_SYMBOLS.get(currency, '$')}{price_value:.2f}"
                                 })
                         
                         if chart_data:
@@ -2927,7 +3949,7 @@ def sales_history_tab():
                         for order in filtered_orders:
                             price_display = order.get('price', 'N/A')
                             currency = order.get('currency', 'USD')
-                            symbol = currency_symbols.get(currency, "$")
+                            symbol = CURRENCY_SYMBOLS.get(currency, "$")
                             
                             price_value = order.get('price_value')
                             if price_value:
@@ -3009,6 +4031,13 @@ def main_dashboard():
                     st.session_state.active_tab = "📋 CLIENT ORDERS"
                     st.rerun()
         
+        stale = stale_sheets()
+        if stale:
+            st.markdown("---")
+            st.markdown("### ⚠️ Data Freshness")
+            for sheet_name, fetched_at in stale:
+                st.markdown(f"**{sheet_name}:** refresh failed, showing data from {format_time_ago(datetime.fromtimestamp(fetched_at))}")
+        
         st.markdown("---")
         st.markdown("### 📢 Updates")
         announcements = [
@@ -3056,6 +4085,7 @@ def main_dashboard():
 # MAIN EXECUTION
 # ============================================
 if __name__ == "__main__":
+    start_sheet_refresher()
     if not check_login():
         login_page()
     else: